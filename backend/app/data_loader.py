@@ -1,36 +1,267 @@
 import pandas as pd
+import hashlib
 import os
-from typing import List, Dict, Tuple
+import threading
+import time
+from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 
+from .food_index import FoodSearchIndex, normalize_dish_name, food_id
+from .diet_flags import DIET_FLAG_COLUMNS, compute_diet_flags, apply_diet_overrides
+
+# Default dataset (one level up from backend/)
+DEFAULT_SOURCES = [Path(__file__).parent.parent.parent / "Indian_Food_Nutrition_Processed.csv"]
+
+# Seconds between checks of source files for changes
+RELOAD_CHECK_INTERVAL = float(os.getenv("FOOD_DATA_RELOAD_INTERVAL", "5"))
+
+REQUIRED_COLUMNS = ['Dish Name', 'Calories (kcal)']
+
+# Nutrition info key -> dataset column
+NUTRIENT_COLUMNS = {
+    'carbohydrates': 'Carbohydrates (g)',
+    'protein': 'Protein (g)',
+    'fats': 'Fats (g)',
+    'fiber': 'Fibre (g)',
+    'calcium': 'Calcium (mg)',
+    'iron': 'Iron (mg)',
+    'vitamin_c': 'Vitamin C (mg)',
+    'sodium': 'Sodium (mg)',
+    'free_sugar': 'Free Sugar (g)',
+    'folate': 'Folate (µg)',
+}
+
+
+def _sources_from_env() -> List[Path]:
+    """
+    Read catalog sources from FOOD_DATA_SOURCES (os.pathsep separated list of
+    CSV/Parquet files). Later sources override earlier ones for the same dish.
+    """
+    raw = os.getenv("FOOD_DATA_SOURCES")
+    if not raw:
+        return list(DEFAULT_SOURCES)
+    return [Path(part) for part in raw.split(os.pathsep) if part.strip()]
+
+
+def _read_source(path: Path) -> pd.DataFrame:
+    """Read a single CSV or Parquet source"""
+    if path.suffix.lower() in (".parquet", ".pq"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Dataset {path} is missing columns: {missing}")
+    return df
+
+
+class FoodCatalog:
+    """
+    Immutable snapshot of the merged dataset, its meal categorization and
+    name search index. A reload builds a new snapshot and swaps the loader's
+    reference, so readers holding the old one are never affected.
+    """
+
+    def __init__(self, df: pd.DataFrame, signature: Tuple,
+                 categorized: Dict[str, List[Tuple]], category_rows: Dict[str, List[int]]):
+        self.df = df
+        self.signature = signature
+        self.content_hash = self._content_hash(df)
+        self.loaded_at = time.time()
+        self.search_index = FoodSearchIndex(df['Dish Name'].tolist())
+        # category_rows[meal][i] is the df position of categorized[meal][i]
+        self.categorized = categorized
+        self.category_rows = category_rows
+        self._flag_views: Dict[str, Dict[str, List[Tuple]]] = {}
+
+    @staticmethod
+    def _content_hash(df: pd.DataFrame) -> str:
+        """Hash of the columns plans are built from (names, nutrients and diet flags)"""
+        columns = ['Dish Name', 'Calories (kcal)'] + list(NUTRIENT_COLUMNS.values()) + list(DIET_FLAG_COLUMNS.values())
+        hashed = pd.util.hash_pandas_object(df[[c for c in columns if c in df.columns]], index=False)
+        return hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()
+
+    def foods_with_flag(self, flag: str) -> Dict[str, List[Tuple]]:
+        """Categorized foods whose diet flag column is set (cached per flag)"""
+        view = self._flag_views.get(flag)
+        if view is None:
+            mask = self.df[DIET_FLAG_COLUMNS[flag]].to_numpy()
+            view = {
+                meal: [item for item, row in zip(items, self.category_rows[meal]) if mask[row]]
+                for meal, items in self.categorized.items()
+            }
+            self._flag_views[flag] = view
+        return view
+
+
 class IndianFoodDataLoader:
     """Loads and processes the Indian Food Nutrition dataset"""
     
-    def __init__(self):
-        # Get the path to the CSV file (one level up from backend/app)
-        self.csv_path = Path(__file__).parent.parent.parent / "Indian_Food_Nutrition_Processed.csv"
-        self.df = None
+    def __init__(self, sources: Optional[List] = None, overrides_path: Optional[str] = None):
+        self.sources = [Path(source) for source in sources] if sources else _sources_from_env()
+        overrides_path = overrides_path or os.getenv("FOOD_DIET_OVERRIDES")
+        self.overrides_path = Path(overrides_path) if overrides_path else None
+        self._catalog: Optional[FoodCatalog] = None
+        self._reload_lock = threading.Lock()
+        self._schedule_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+        self._last_check = 0.0
         self.load_data()
+
+    @property
+    def csv_path(self) -> Path:
+        """Primary dataset path (kept for backwards compatibility)"""
+        return self.sources[0]
+
+    @property
+    def catalog(self) -> FoodCatalog:
+        """
+        Current catalog snapshot. Source changes are picked up by a background
+        reload, so readers never wait for a rebuild.
+        """
+        self._schedule_reload()
+        return self._catalog
+
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        return self._catalog.df if self._catalog is not None else None
+
+    def _sources_signature(self) -> Tuple:
+        """(path, mtime, size) for every source and the overrides file; missing files are recorded as None"""
+        paths = self.sources + ([self.overrides_path] if self.overrides_path else [])
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((str(path), None, None))
+        return tuple(signature)
+
+    def _build_catalog(self, signature: Tuple) -> FoodCatalog:
+        """Load all sources, merge them and de-duplicate by normalized dish name"""
+        frames = []
+        for path in self.sources:
+            try:
+                frames.append(_read_source(path))
+            except FileNotFoundError:
+                print(f"Dataset file not found at {path}")
+                raise
+
+        merged = pd.concat(frames, ignore_index=True)
+        merged = merged.dropna(subset=['Dish Name'])
+
+        # Calories are used as integers downstream; drop rows without a usable value
+        calories = pd.to_numeric(merged['Calories (kcal)'], errors='coerce')
+        valid = calories.notna() & calories.abs().lt(float('inf'))
+        if not valid.all():
+            print(f"Skipping {int((~valid).sum())} row(s) with missing or non-numeric 'Calories (kcal)'")
+        merged = merged[valid].copy()
+        merged['Calories (kcal)'] = calories[valid]
+        merged['Name Key'] = merged['Dish Name'].map(normalize_dish_name)
+        merged = merged.drop_duplicates(subset='Name Key', keep='last').reset_index(drop=True)
+        merged['Food ID'] = merged['Dish Name'].map(food_id)
+
+        compute_diet_flags(merged)
+        if self.overrides_path is not None and self.overrides_path.exists():
+            apply_diet_overrides(merged, self.overrides_path)
+
+        categorized, category_rows = self._categorize(merged)
+        return FoodCatalog(merged, signature, categorized, category_rows)
     
     def load_data(self):
-        """Load the CSV data into a pandas DataFrame"""
-        try:
-            self.df = pd.read_csv(self.csv_path)
-            print(f"Loaded {len(self.df)} food items from dataset")
-        except FileNotFoundError:
-            print(f"Dataset file not found at {self.csv_path}")
-            raise
-        except Exception as e:
-            print(f"Error loading dataset: {e}")
-            raise
+        """Load all sources into a new catalog snapshot and swap it in"""
+        with self._reload_lock:
+            signature = self._sources_signature()
+            try:
+                catalog = self._build_catalog(signature)
+            except Exception as e:
+                print(f"Error loading dataset: {e}")
+                raise
+            self._catalog = catalog
+            self._last_check = time.monotonic()
+        print(f"Loaded {len(catalog.df)} food items from {len(self.sources)} source(s)")
+
+    def _schedule_reload(self):
+        """Start a background reload check once RELOAD_CHECK_INTERVAL has passed, unless one is running"""
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+        with self._schedule_lock:
+            if now - self._last_check < RELOAD_CHECK_INTERVAL:
+                return
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return
+            self._last_check = now
+            self._reload_thread = threading.Thread(
+                target=self._reload, name="food-catalog-reload", daemon=True
+            )
+            self._reload_thread.start()
+
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """
+        Rebuild the catalog in the calling thread if any source changed on disk.
+        Checks are throttled to RELOAD_CHECK_INTERVAL unless forced. A failed
+        reload keeps serving the previous snapshot.
+        Returns True when a new snapshot was swapped in.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return False
+        self._last_check = now
+        return self._reload(force)
+
+    def _reload(self, force: bool = False) -> bool:
+        signature = self._sources_signature()
+        if not force and self._catalog is not None and signature == self._catalog.signature:
+            return False
+
+        with self._reload_lock:
+            # Another thread may have reloaded while we waited for the lock
+            if not force and self._catalog is not None and signature == self._catalog.signature:
+                return False
+            try:
+                catalog = self._build_catalog(signature)
+            except Exception as e:
+                print(f"Error reloading dataset, keeping previous catalog: {e}")
+                return False
+            self._catalog = catalog
+        print(f"Reloaded {len(catalog.df)} food items from {len(self.sources)} source(s)")
+        return True
+
+    @staticmethod
+    def _nutrition_from_row(row) -> Dict:
+        """
+        Nutrition info dict with all nutrients for a dataset row.
+        Missing values (NaN or absent column) are reported as 0.
+        """
+        nutrition = {}
+        for key, column in NUTRIENT_COLUMNS.items():
+            value = row.get(column)
+            nutrition[key] = 0.0 if value is None or pd.isna(value) else float(value)
+        return nutrition
+
+    def search_foods(self, query: str, limit: int = 10) -> List[Dict]:
+        """Typeahead search over dish names"""
+        catalog = self.catalog
+        results = []
+        for doc_id in catalog.search_index.search(query, limit=limit):
+            row = catalog.df.iloc[doc_id]
+            results.append({
+                'id': int(row['Food ID']),
+                'name': row['Dish Name'],
+                'calories': int(row['Calories (kcal)']),
+                'serving_size': 100.0,
+                'nutrition': self._nutrition_from_row(row)
+            })
+        return results
     
-    def categorize_foods(self) -> Dict[str, List[Tuple[str, int, Dict]]]:
+    def _categorize(self, df: pd.DataFrame) -> Tuple[Dict[str, List[Tuple]], Dict[str, List[int]]]:
         """
         Categorize foods into breakfast, lunch, and dinner based on dish names and calories.
-        Returns dict with meal categories containing (name, calories, nutrition_info) tuples.
+        Returns dict with meal categories containing (name, calories, nutrition_info, serving_size)
+        tuples, and a parallel dict with the df position of each item.
         """
-        if self.df is None:
-            raise ValueError("Dataset not loaded")
         
         # Define keywords for meal categorization
         breakfast_keywords = [
@@ -57,8 +288,13 @@ class IndianFoodDataLoader:
             'lunch': [],
             'dinner': []
         }
+        category_rows = {meal: [] for meal in categorized}
+
+        def add(category, position, item):
+            categorized[category].append(item)
+            category_rows[category].append(position)
         
-        for _, row in self.df.iterrows():
+        for position, row in df.iterrows():
             dish_name = row['Dish Name'].lower()
             calories = row['Calories (kcal)']
             
@@ -67,18 +303,7 @@ class IndianFoodDataLoader:
                 continue
             
             # Create nutrition info dict with all available nutrients
-            nutrition_info = {
-                'carbohydrates': row['Carbohydrates (g)'],
-                'protein': row['Protein (g)'],
-                'fats': row['Fats (g)'],
-                'fiber': row['Fibre (g)'],
-                'calcium': row['Calcium (mg)'],
-                'iron': row['Iron (mg)'],
-                'vitamin_c': row['Vitamin C (mg)'],
-                'sodium': row.get('Sodium (mg)', 0),
-                'free_sugar': row.get('Free Sugar (g)', 0),
-                'folate': row.get('Folate (µg)', 0)
-            }
+            nutrition_info = self._nutrition_from_row(row)
             
             # Include serving size (default to 100g as that's what the nutrition data is based on)
             serving_size = 100.0  # grams
@@ -90,86 +315,79 @@ class IndianFoodDataLoader:
             is_light = any(keyword in dish_name for keyword in light_dinner_keywords)
             
             if is_breakfast or calories < 100:
-                categorized['breakfast'].append(food_item)
+                add('breakfast', position, food_item)
             elif is_light or (calories < 200 and not is_lunch_dinner):
-                categorized['dinner'].append(food_item)
+                add('dinner', position, food_item)
             elif is_lunch_dinner or calories > 300:
-                categorized['lunch'].append(food_item)
+                add('lunch', position, food_item)
             else:
                 # Default categorization based on calorie content
                 if calories < 150:
-                    categorized['breakfast'].append(food_item)
+                    add('breakfast', position, food_item)
                 elif calories > 400:
-                    categorized['lunch'].append(food_item)
+                    add('lunch', position, food_item)
                 else:
-                    categorized['dinner'].append(food_item)
+                    add('dinner', position, food_item)
         
         # Ensure each category has enough options
         min_items = 20
         for category in categorized:
             if len(categorized[category]) < min_items:
                 # Add some general items to ensure variety
+                existing = {item[:2] for item in categorized[category]}
                 remaining_items = [
-                    (row['Dish Name'], int(row['Calories (kcal)']), {
-                        'carbohydrates': row['Carbohydrates (g)'],
-                        'protein': row['Protein (g)'],
-                        'fats': row['Fats (g)'],
-                        'fiber': row['Fibre (g)'],
-                        'calcium': row['Calcium (mg)'],
-                        'iron': row['Iron (mg)'],
-                        'vitamin_c': row['Vitamin C (mg)'],
-                        'sodium': row.get('Sodium (mg)', 0),
-                        'free_sugar': row.get('Free Sugar (g)', 0),
-                        'folate': row.get('Folate (µg)', 0)
-                    }, 100.0)
-                    for _, row in self.df.iterrows()
-                    if row['Calories (kcal)'] >= 20 and 
-                    (row['Dish Name'], int(row['Calories (kcal)']), {}) not in 
-                    [item[:2] + ({},) for item in categorized[category]]
+                    (position, (row['Dish Name'], int(row['Calories (kcal)']), self._nutrition_from_row(row), 100.0))
+                    for position, row in df.iterrows()
+                    if row['Calories (kcal)'] >= 20 and
+                    (row['Dish Name'], int(row['Calories (kcal)'])) not in existing
                 ]
                 
                 # Add items based on calorie appropriateness for the meal
                 if category == 'breakfast':
-                    suitable_items = [item for item in remaining_items if 50 <= item[1] <= 300]
+                    suitable_items = [entry for entry in remaining_items if 50 <= entry[1][1] <= 300]
                 elif category == 'lunch':
-                    suitable_items = [item for item in remaining_items if 200 <= item[1] <= 800]
+                    suitable_items = [entry for entry in remaining_items if 200 <= entry[1][1] <= 800]
                 else:  # dinner
-                    suitable_items = [item for item in remaining_items if 100 <= item[1] <= 500]
+                    suitable_items = [entry for entry in remaining_items if 100 <= entry[1][1] <= 500]
                 
                 # Add items to reach minimum count
                 needed = min_items - len(categorized[category])
-                categorized[category].extend(suitable_items[:needed])
+                for position, item in suitable_items[:needed]:
+                    add(category, position, item)
         
         print(f"Categorized foods: Breakfast: {len(categorized['breakfast'])}, "
               f"Lunch: {len(categorized['lunch'])}, Dinner: {len(categorized['dinner'])}")
         
-        return categorized
+        return categorized, category_rows
+
+    def categorize_foods(self) -> Dict[str, List[Tuple[str, int, Dict]]]:
+        """
+        Foods categorized into breakfast, lunch, and dinner.
+        Categorization runs once per catalog build; this returns copies of the cached lists.
+        """
+        catalog = self.catalog
+        if catalog is None:
+            raise ValueError("Dataset not loaded")
+        return {meal: list(items) for meal, items in catalog.categorized.items()}
+
+    def get_foods_by_flag(self, flag: str) -> Dict[str, List[Tuple[str, int, Dict]]]:
+        """
+        Categorized foods matching a diet flag ('veg', 'egg', 'nonveg', 'vegan', 'jain').
+        Flags are precomputed catalog columns, so this is a mask lookup.
+        """
+        if flag not in DIET_FLAG_COLUMNS:
+            raise ValueError(f"Unknown diet flag: {flag}")
+        catalog = self.catalog
+        if catalog is None:
+            raise ValueError("Dataset not loaded")
+        return {meal: list(items) for meal, items in catalog.foods_with_flag(flag).items()}
     
     def get_vegetarian_foods(self) -> Dict[str, List[Tuple[str, int, Dict]]]:
         """
-        Filter and return vegetarian foods only.
-        This is a simple implementation - in a real scenario, you might have 
-        a separate column indicating vegetarian status.
+        Filter and return vegetarian foods only (no meat, fish or egg).
+        Uses the precomputed 'Is Veg' catalog column.
         """
-        all_foods = self.categorize_foods()
-        
-        # Keywords that typically indicate non-vegetarian food
-        non_veg_keywords = [
-            'chicken', 'mutton', 'lamb', 'beef', 'pork', 'fish', 'prawn', 
-            'shrimp', 'crab', 'meat', 'egg', 'omelet', 'omelette'
-        ]
-        
-        veg_foods = {}
-        for meal_type, foods in all_foods.items():
-            veg_foods[meal_type] = [
-                food for food in foods 
-                if not any(keyword in food[0].lower() for keyword in non_veg_keywords)
-            ]
-        
-        print(f"Vegetarian foods: Breakfast: {len(veg_foods['breakfast'])}, "
-              f"Lunch: {len(veg_foods['lunch'])}, Dinner: {len(veg_foods['dinner'])}")
-        
-        return veg_foods
+        return self.get_foods_by_flag('veg')
     
     def get_non_vegetarian_foods(self) -> Dict[str, List[Tuple[str, int, Dict]]]:
         """
@@ -179,20 +397,21 @@ class IndianFoodDataLoader:
     
     def get_food_stats(self) -> Dict:
         """Get basic statistics about the dataset"""
-        if self.df is None:
+        df = self.df
+        if df is None:
             return {}
         
         return {
-            'total_foods': len(self.df),
+            'total_foods': len(df),
             'calorie_range': {
-                'min': self.df['Calories (kcal)'].min(),
-                'max': self.df['Calories (kcal)'].max(),
-                'mean': self.df['Calories (kcal)'].mean()
+                'min': df['Calories (kcal)'].min(),
+                'max': df['Calories (kcal)'].max(),
+                'mean': df['Calories (kcal)'].mean()
             },
             'protein_range': {
-                'min': self.df['Protein (g)'].min(),
-                'max': self.df['Protein (g)'].max(),
-                'mean': self.df['Protein (g)'].mean()
+                'min': df['Protein (g)'].min(),
+                'max': df['Protein (g)'].max(),
+                'mean': df['Protein (g)'].mean()
             }
         }
 
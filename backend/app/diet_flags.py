@@ -0,0 +1,139 @@
+import re
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from .food_index import normalize_dish_name
+
+# Diet flag -> catalog column holding the boolean flag
+DIET_FLAG_COLUMNS = {
+    'nonveg': 'Is Non Veg',
+    'egg': 'Has Egg',
+    'veg': 'Is Veg',
+    'vegan': 'Is Vegan',
+    'jain': 'Is Jain',
+}
+
+
+def _word_pattern(words: List[str]) -> re.Pattern:
+    """Case-insensitive whole-word matcher (optional plural), so 'egg' does not match 'eggplant'"""
+    alternatives = "|".join(sorted((re.escape(word) for word in words), key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})(?:s|es)?\b", re.IGNORECASE)
+
+
+NON_VEG_PATTERN = _word_pattern([
+    'chicken', 'mutton', 'lamb', 'beef', 'pork', 'fish', 'prawn', 'shrimp',
+    'crab', 'lobster', 'squid', 'meat', 'keema', 'kheema', 'gosht', 'murg',
+    'murgh', 'machli', 'machhi', 'tuna', 'salmon', 'liver', 'bacon', 'ham',
+    'sausage', 'salami', 'seafood'
+])
+
+EGG_PATTERN = _word_pattern(['egg', 'omelet', 'omelette', 'omlet', 'anda', 'ande'])
+
+# Explicitly egg-free dishes, e.g. 'Mayonnaise without eggs'
+EGG_FREE_PATTERN = re.compile(r"\bwithout eggs?\b", re.IGNORECASE)
+
+# Animal products other than meat and egg (excluded for vegan)
+DAIRY_PATTERN = _word_pattern([
+    'milk', 'paneer', 'curd', 'dahi', 'ghee', 'butter', 'buttermilk', 'cheese',
+    'cream', 'yogurt', 'yoghurt', 'lassi', 'chaas', 'khoa', 'khoya', 'kheer',
+    'raita', 'malai', 'makhani', 'rabri', 'kulfi', 'rasgulla', 'honey',
+    'shake', 'milkshake'
+])
+
+# Root vegetables and bulbs (excluded for jain)
+JAIN_EXCLUDED_PATTERN = _word_pattern([
+    'potato', 'aloo', 'alu', 'onion', 'pyaz', 'pyaaz', 'garlic', 'lahsun',
+    'ginger', 'adrak', 'carrot', 'gajar', 'beetroot', 'beet', 'radish', 'mooli',
+    'turnip', 'shalgam', 'yam', 'arbi', 'colocasia', 'mushroom', 'shakarkandi'
+])
+
+
+def compute_diet_flags(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add one boolean column per diet flag (see DIET_FLAG_COLUMNS).
+    Runs once per catalog build; request-time filtering is a mask lookup.
+    """
+    names = df['Dish Name'].astype(str)
+
+    def matches(pattern: re.Pattern) -> pd.Series:
+        return names.map(lambda name: pattern.search(name) is not None)
+
+    nonveg = matches(NON_VEG_PATTERN)
+    egg = matches(EGG_PATTERN) & ~matches(EGG_FREE_PATTERN)
+    veg = ~nonveg & ~egg
+
+    df[DIET_FLAG_COLUMNS['nonveg']] = nonveg
+    df[DIET_FLAG_COLUMNS['egg']] = egg
+    df[DIET_FLAG_COLUMNS['veg']] = veg
+    df[DIET_FLAG_COLUMNS['vegan']] = veg & ~matches(DAIRY_PATTERN)
+    df[DIET_FLAG_COLUMNS['jain']] = veg & ~matches(JAIN_EXCLUDED_PATTERN)
+    return df
+
+
+def _parse_flag(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+
+def _derived_flags(name: str, nonveg: bool, egg: bool) -> Dict[str, bool]:
+    """veg/vegan/jain for one dish, derived the same way as in compute_diet_flags"""
+    veg = not nonveg and not egg
+    return {
+        'veg': veg,
+        'vegan': veg and DAIRY_PATTERN.search(name) is None,
+        'jain': veg and JAIN_EXCLUDED_PATTERN.search(name) is None,
+    }
+
+
+def apply_diet_overrides(df: pd.DataFrame, path: Path, name_key_column: str = 'Name Key') -> pd.DataFrame:
+    """
+    Apply manual flag corrections from a sidecar CSV.
+
+    The file has a 'Dish Name' column plus any of the flag columns, named either
+    by flag ('veg', 'jain', ...) or by catalog column ('Is Veg', ...). Empty
+    cells leave the computed flag unchanged. veg, vegan and jain are re-derived
+    from the (possibly overridden) nonveg/egg flags unless set explicitly.
+    """
+    overrides = pd.read_csv(path)
+    if 'Dish Name' not in overrides.columns:
+        raise ValueError(f"Diet overrides {path} must have a 'Dish Name' column")
+
+    column_map: Dict[str, str] = {}
+    for flag, column in DIET_FLAG_COLUMNS.items():
+        if flag in overrides.columns:
+            column_map[flag] = flag
+        elif column in overrides.columns:
+            column_map[column] = flag
+
+    locations = {flag: df.columns.get_loc(column) for flag, column in DIET_FLAG_COLUMNS.items()}
+
+    positions = pd.Series(range(len(df)), index=df[name_key_column])
+    applied = 0
+    for _, row in overrides.iterrows():
+        key = normalize_dish_name(row['Dish Name'])
+        if key not in positions.index:
+            continue
+        position = positions[key]
+        explicit = {}
+        for source_column, flag in column_map.items():
+            value = row[source_column]
+            if not pd.isna(value):
+                explicit[flag] = _parse_flag(value)
+        for flag, value in explicit.items():
+            df.iloc[position, locations[flag]] = value
+
+        derived = _derived_flags(
+            str(df.iloc[position, df.columns.get_loc('Dish Name')]),
+            bool(df.iloc[position, locations['nonveg']]),
+            bool(df.iloc[position, locations['egg']]),
+        )
+        for flag, value in derived.items():
+            if flag not in explicit:
+                df.iloc[position, locations[flag]] = value
+        applied += 1
+
+    print(f"Applied diet overrides for {applied} dish(es) from {path}")
+    return df
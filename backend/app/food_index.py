@@ -0,0 +1,135 @@
+import re
+import zlib
+from bisect import bisect_left
+from typing import Dict, List, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_dish_name(name) -> str:
+    """Normalize a dish name for de-duplication (case and whitespace insensitive)"""
+    return " ".join(str(name).lower().split())
+
+
+def food_id(name) -> int:
+    """Stable catalog ID for a dish, derived from its normalized name"""
+    return zlib.crc32(normalize_dish_name(name).encode("utf-8"))
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a dish name or query into lowercase alphanumeric tokens"""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Character trigrams of a word, padded so short words still produce grams"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FoodSearchIndex:
+    """
+    In-memory typeahead index over dish names.
+
+    Holds a sorted token list for prefix lookups (bisect, no scanning) and an
+    inverted trigram index used as a fuzzy fallback for typos. The index is
+    built once per catalog snapshot and never mutated afterwards, so it can be
+    shared between request threads without locking.
+    """
+
+    def __init__(self, names: List[str], min_similarity: float = 0.5):
+        self.names = list(names)
+        self.min_similarity = min_similarity
+        self._doc_tokens: List[List[str]] = [tokenize(name) for name in self.names]
+        self._doc_keys: List[str] = [" ".join(tokens) for tokens in self._doc_tokens]
+
+        # Sorted (token, doc_id) pairs; every token of every name is a prefix entry point
+        token_entries = set()
+        for doc_id, tokens in enumerate(self._doc_tokens):
+            for token in tokens:
+                token_entries.add((token, doc_id))
+        self._token_entries: List[Tuple[str, int]] = sorted(token_entries)
+
+        # Trigram -> doc ids for the fuzzy fallback
+        self._trigram_postings: Dict[str, Set[int]] = {}
+        for doc_id, tokens in enumerate(self._doc_tokens):
+            grams = set()
+            for token in tokens:
+                grams |= _trigrams(token)
+            for gram in grams:
+                self._trigram_postings.setdefault(gram, set()).add(doc_id)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _prefix_docs(self, prefix: str) -> Set[int]:
+        """Doc ids having at least one token that starts with `prefix`"""
+        docs = set()
+        start = bisect_left(self._token_entries, (prefix, -1))
+        for token, doc_id in self._token_entries[start:]:
+            if not token.startswith(prefix):
+                break
+            docs.add(doc_id)
+        return docs
+
+    def _fuzzy_docs(self, query_tokens: List[str]) -> List[Tuple[float, int]]:
+        """Score docs by how many of the query's trigrams they contain"""
+        query_grams = set()
+        for token in query_tokens:
+            query_grams |= _trigrams(token)
+        if not query_grams:
+            return []
+
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for doc_id in self._trigram_postings.get(gram, ()):
+                shared[doc_id] = shared.get(doc_id, 0) + 1
+
+        # Fraction of query trigrams found in the name, so long names are not penalised
+        scored = []
+        for doc_id, count in shared.items():
+            similarity = count / len(query_grams)
+            if similarity >= self.min_similarity:
+                scored.append((similarity, doc_id))
+        scored.sort(key=lambda pair: (-pair[0], len(self._doc_keys[pair[1]]), pair[1]))
+        return scored
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Return up to `limit` doc ids (positions in `names`) matching the query.
+
+        Ranking: names starting with the query, then names where every query
+        token prefixes some name token, then fuzzy trigram matches.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens or limit <= 0:
+            return []
+
+        candidates = self._prefix_docs(query_tokens[0])
+        for token in query_tokens[1:]:
+            if not candidates:
+                break
+            candidates &= self._prefix_docs(token)
+
+        query_key = " ".join(query_tokens)
+        ranked = sorted(
+            candidates,
+            key=lambda doc_id: (
+                not self._doc_keys[doc_id].startswith(query_key),
+                len(self._doc_keys[doc_id]),
+                doc_id,
+            ),
+        )
+        results = ranked[:limit]
+        if len(results) >= limit:
+            return results
+
+        seen = set(results)
+        for _, doc_id in self._fuzzy_docs(query_tokens):
+            if doc_id in seen:
+                continue
+            results.append(doc_id)
+            seen.add(doc_id)
+            if len(results) >= limit:
+                break
+        return results
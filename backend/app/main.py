@@ -3,6 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .routes_auth import router as auth_router
 from .routes_meal import router as meal_router
+from .routes_food import router as food_router
+from .compression import CompressionMiddleware
 from .db import Base, engine
 
 # Create tables
@@ -22,6 +24,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=500)
 
 @app.get("/")
 async def root():
@@ -29,3 +32,4 @@ async def root():
 
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
 app.include_router(meal_router, prefix="/api/meal", tags=["meal"])
+app.include_router(food_router, prefix="/api/foods", tags=["foods"])
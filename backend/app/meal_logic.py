@@ -3,6 +3,23 @@ from .models import FoodTypeEnum
 from .data_loader import food_data_loader
 import random
 
+# Calorie and protein distribution per meal
+MEAL_DISTRIBUTION = {
+    "breakfast": {"calorie_ratio": 0.25, "protein_ratio": 0.20},
+    "lunch": {"calorie_ratio": 0.45, "protein_ratio": 0.50},
+    "dinner": {"calorie_ratio": 0.30, "protein_ratio": 0.30},
+}
+
+
+def daily_protein_requirement(weight_kg: float, gender: str) -> float:
+    """
+    Daily protein requirement based on weight and gender.
+    Female: 0.8-1.0g per kg body weight, Male: 1.0-1.2g per kg body weight
+    """
+    if gender.lower() == "female":
+        return weight_kg * 0.9  # Slightly lower for females
+    return weight_kg * 1.0  # Standard for males
+
 
 def _enhanced_knapsack_with_nutrition(
     items: List[Tuple[str, int, Dict, float]], 
@@ -136,7 +153,8 @@ def _simple_knapsack_fallback(items: List[Tuple[str, int, Dict, float]], capacit
 
 
 def generate_meal_plan(age: int, weight_kg: float, calories_limit: int, food_type: FoodTypeEnum, 
-                      height_cm: float = 170, gender: str = "male", activity_level: str = "moderate") -> Dict:
+                      height_cm: float = 170, gender: str = "male", activity_level: str = "moderate",
+                      rng: Optional[random.Random] = None) -> Dict:
     """
     Generate a personalized meal plan using the Indian food dataset and knapsack algorithm.
     
@@ -148,6 +166,7 @@ def generate_meal_plan(age: int, weight_kg: float, calories_limit: int, food_typ
         height_cm: User's height in centimeters
         gender: User's gender ("male" or "female")
         activity_level: User's activity level
+        rng: Random generator for option sampling (defaults to the global one)
     
     Returns:
         Dictionary containing meal plan with nutritional information
@@ -160,12 +179,7 @@ def generate_meal_plan(age: int, weight_kg: float, calories_limit: int, food_typ
             options = food_data_loader.get_non_vegetarian_foods()
         
         # Calculate protein requirements based on weight and gender
-        # Female: 0.8-1.0g per kg body weight, Male: 1.0-1.2g per kg body weight
-        if gender.lower() == "female":
-            daily_protein_requirement = weight_kg * 0.9  # Slightly lower for females
-        else:
-            
-            daily_protein_requirement = weight_kg * 1.0  # Standard for males
+        protein_requirement = daily_protein_requirement(weight_kg, gender)
         
         # Calculate BMR using Mifflin-St Jeor Equation for better targeting
         if gender.lower() == "female":
@@ -185,13 +199,6 @@ def generate_meal_plan(age: int, weight_kg: float, calories_limit: int, food_typ
         # Calculate recommended calories based on BMR and activity
         recommended_calories = bmr * activity_multipliers.get(activity_level, 1.55)
         
-        # Calorie and protein distribution per meal
-        meal_distribution = {
-            "breakfast": {"calorie_ratio": 0.25, "protein_ratio": 0.20},
-            "lunch": {"calorie_ratio": 0.45, "protein_ratio": 0.50},
-            "dinner": {"calorie_ratio": 0.30, "protein_ratio": 0.30},
-        }
-        
         plan = {
             "breakfast": [],
             "lunch": [],
@@ -222,8 +229,8 @@ def generate_meal_plan(age: int, weight_kg: float, calories_limit: int, food_typ
         
         for meal_type in ["breakfast", "lunch", "dinner"]:
             # Calculate targets for this meal
-            calorie_target = int(calories_limit * meal_distribution[meal_type]["calorie_ratio"])
-            protein_target = daily_protein_requirement * meal_distribution[meal_type]["protein_ratio"]
+            calorie_target = int(calories_limit * MEAL_DISTRIBUTION[meal_type]["calorie_ratio"])
+            protein_target = protein_requirement * MEAL_DISTRIBUTION[meal_type]["protein_ratio"]
             
             # Get available options for this meal
             meal_options = options.get(meal_type, [])
@@ -240,7 +247,7 @@ def generate_meal_plan(age: int, weight_kg: float, calories_limit: int, food_typ
             # Add some randomization to avoid always getting the same meals
             if len(meal_options) > 20:
                 # Randomly sample a subset for variety
-                meal_options = random.sample(meal_options, min(50, len(meal_options)))
+                meal_options = (rng or random).sample(meal_options, min(50, len(meal_options)))
             
             # Use enhanced knapsack algorithm
             selected_items, meal_calories, meal_nutrition = _enhanced_knapsack_with_nutrition(
@@ -276,7 +283,7 @@ def generate_meal_plan(age: int, weight_kg: float, calories_limit: int, food_typ
         plan["total_nutrition"] = total_nutrition
         plan["daily_targets"] = {
             "calories": calories_limit,
-            "protein": daily_protein_requirement
+            "protein": protein_requirement
         }
         plan["nutritional_analysis"] = {
             "protein_percentage": (total_nutrition["protein"] * 4 / total_calories * 100) if total_calories > 0 else 0,
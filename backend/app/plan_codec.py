@@ -0,0 +1,101 @@
+import base64
+import json
+import os
+import zlib
+from typing import Dict, List, Optional
+
+from .food_index import food_id
+from .schemas import NutritionInfo
+
+# Media type clients send in Accept (or ?format=compact) to get the compact payload
+COMPACT_MEDIA_TYPE = "application/vnd.smartdiet.compact+json"
+COMPACT_FORMAT = "compact-v1"
+COMPACT_PRECISION = 2
+
+# Nutrient vectors in compact payloads follow this field order
+NUTRIENT_FIELDS: List[str] = list(NutritionInfo.model_fields)
+
+MEAL_TYPES = ["breakfast", "lunch", "dinner"]
+
+# Prefix marking zlib-compressed, base64-encoded plan JSON in meal_plans.plan_json
+_STORED_PREFIX = "z2:"
+COMPRESS_PLAN_JSON = os.getenv("COMPRESS_PLAN_JSON", "1") == "1"
+
+
+def wants_compact(accept: Optional[str], requested_format: Optional[str] = None) -> bool:
+    """True when the client asked for the compact payload via query parameter or Accept header"""
+    if requested_format is not None:
+        return requested_format == "compact"
+    return bool(accept) and COMPACT_MEDIA_TYPE in accept
+
+
+def _round(value, precision: int):
+    if value is None:
+        return None
+    return round(float(value), precision)
+
+
+def _nutrient_vector(nutrition: Optional[Dict], precision: int) -> Optional[List]:
+    if nutrition is None:
+        return None
+    return [_round(nutrition.get(field, 0), precision) for field in NUTRIENT_FIELDS]
+
+
+def compact_plan(plan: Dict, precision: int = COMPACT_PRECISION) -> Dict:
+    """
+    Compact representation of a meal plan: items are referenced by catalog ID,
+    each food's nutrients are sent once in `foods`, nutrient dicts become vectors
+    ordered as `nutrients`, and numbers are rounded to `precision` decimals.
+    """
+    foods: Dict[str, Dict] = {}
+    compact = {"format": COMPACT_FORMAT, "nutrients": NUTRIENT_FIELDS, "foods": foods}
+
+    for meal_type in MEAL_TYPES:
+        ids = []
+        for item in plan.get(meal_type, []):
+            item_id = str(food_id(item["name"]))
+            if item_id not in foods:
+                foods[item_id] = {
+                    "name": item["name"],
+                    "calories": item["calories"],
+                    "serving_size": _round(item.get("serving_size"), precision),
+                    "nutrition": _nutrient_vector(item.get("nutrition"), precision),
+                }
+            ids.append(item_id)
+        compact[meal_type] = ids
+
+    compact["total_calories"] = plan.get("total_calories", 0)
+    compact["total_nutrition"] = _nutrient_vector(plan.get("total_nutrition"), precision)
+
+    if plan.get("meal_breakdown") is not None:
+        compact["meal_breakdown"] = {
+            meal_type: {
+                "calories": breakdown.get("calories"),
+                "target_calories": breakdown.get("target_calories"),
+                "nutrition": _nutrient_vector(breakdown.get("nutrition"), precision),
+            }
+            for meal_type, breakdown in plan["meal_breakdown"].items()
+        }
+
+    for section in ("daily_targets", "nutritional_analysis"):
+        if plan.get(section) is not None:
+            compact[section] = {
+                key: _round(value, precision) if isinstance(value, float) else value
+                for key, value in plan[section].items()
+            }
+    return compact
+
+
+def encode_plan_json(plan: Dict) -> str:
+    """Serialize a plan for meal_plans.plan_json (zlib-compressed unless COMPRESS_PLAN_JSON=0)"""
+    raw = json.dumps(plan)
+    if not COMPRESS_PLAN_JSON:
+        return raw
+    return _STORED_PREFIX + base64.b64encode(zlib.compress(raw.encode("utf-8"), 9)).decode("ascii")
+
+
+def decode_plan_json(text: str) -> Dict:
+    """Read meal_plans.plan_json written by encode_plan_json or older plain-JSON rows"""
+    if text.startswith(_STORED_PREFIX):
+        return json.loads(zlib.decompress(base64.b64decode(text[len(_STORED_PREFIX):])))
+    return json.loads(text)
@@ -0,0 +1,334 @@
+"""
+Bulk export/import of meal_plans records.
+
+Rows are read with a server-side cursor in fixed-size chunks and written as
+newline-delimited JSON, Parquet or Arrow IPC with flattened nutrient columns,
+so memory use does not grow with the table. Imports insert in batches.
+
+Usage (from backend/):
+    python -m app.plan_export export --format parquet --output plans.parquet
+    python -m app.plan_export import --input plans.parquet
+    python -m app.plan_export bench --rows 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from .db import Base, SessionLocal
+from .models import MealPlan
+from .plan_codec import MEAL_TYPES, NUTRIENT_FIELDS, decode_plan_json, encode_plan_json
+
+DEFAULT_CHUNK_SIZE = 5000
+
+FORMATS = ("ndjson", "parquet", "arrow")
+
+RECORD_COLUMNS = ["id", "user_id", "age", "weight_kg", "calories_limit", "food_type", "created_at"]
+
+# Flattened export columns, in order
+EXPORT_COLUMNS: List[str] = (
+    RECORD_COLUMNS
+    + ["total_calories"]
+    + [f"total_{nutrient}" for nutrient in NUTRIENT_FIELDS]
+    + [f"{meal}_{field}" for meal in MEAL_TYPES for field in ("calories", "target_calories", "items")]
+    + ["plan_json"]
+)
+
+# Separator for dish names in the <meal>_items columns
+ITEM_SEPARATOR = " | "
+
+
+def iter_plan_chunks(db: Session, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     user_id: Optional[int] = None) -> Iterator[List[Dict]]:
+    """Yield flattened meal plan rows in chunks, streamed from a server-side cursor"""
+    table = MealPlan.__table__
+    query = select(table).order_by(table.c.id)
+    if user_id is not None:
+        query = query.where(table.c.user_id == user_id)
+    result = db.execute(query.execution_options(stream_results=True, yield_per=chunk_size))
+    for partition in result.mappings().partitions(chunk_size):
+        yield [flatten_plan_row(row) for row in partition]
+
+
+def flatten_plan_row(row) -> Dict:
+    """One meal_plans row as a flat dict of EXPORT_COLUMNS"""
+    flat = {column: row[column] for column in RECORD_COLUMNS}
+    flat["food_type"] = getattr(row["food_type"], "value", row["food_type"])
+
+    plan = decode_plan_json(row["plan_json"])
+    flat["total_calories"] = plan.get("total_calories")
+    total_nutrition = plan.get("total_nutrition") or {}
+    for nutrient in NUTRIENT_FIELDS:
+        flat[f"total_{nutrient}"] = _as_float(total_nutrition.get(nutrient))
+
+    breakdown = plan.get("meal_breakdown") or {}
+    for meal in MEAL_TYPES:
+        meal_breakdown = breakdown.get(meal) or {}
+        flat[f"{meal}_calories"] = meal_breakdown.get("calories")
+        flat[f"{meal}_target_calories"] = meal_breakdown.get("target_calories")
+        flat[f"{meal}_items"] = ITEM_SEPARATOR.join(item.get("name", "") for item in plan.get(meal, []))
+
+    flat["plan_json"] = row["plan_json"]
+    return flat
+
+
+def _as_float(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Parquet/Arrow export requires the 'pyarrow' package") from e
+    return pyarrow
+
+
+def arrow_schema():
+    pa = _require_pyarrow()
+    fields = [
+        ("id", pa.int64()), ("user_id", pa.int64()), ("age", pa.int64()),
+        ("weight_kg", pa.float64()), ("calories_limit", pa.int64()),
+        ("food_type", pa.string()), ("created_at", pa.timestamp("us", tz="UTC")),
+        ("total_calories", pa.int64()),
+    ]
+    fields += [(f"total_{nutrient}", pa.float64()) for nutrient in NUTRIENT_FIELDS]
+    for meal in MEAL_TYPES:
+        fields += [(f"{meal}_calories", pa.int64()), (f"{meal}_target_calories", pa.int64()),
+                   (f"{meal}_items", pa.string())]
+    fields.append(("plan_json", pa.string()))
+    return pa.schema(fields)
+
+
+def _ndjson_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def ndjson_block(rows: List[Dict]) -> bytes:
+    """Encode a chunk of rows as newline-delimited JSON"""
+    return "".join(json.dumps(row, default=_ndjson_default) + "\n" for row in rows).encode("utf-8")
+
+
+def ndjson_lines(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """Encode row chunks as newline-delimited JSON, one bytes block per chunk"""
+    for rows in chunks:
+        yield ndjson_block(rows)
+
+
+def write_export(chunks: Iterable[List[Dict]], output: Path, fmt: str) -> int:
+    """Write row chunks to `output` in the given format; returns the number of rows"""
+    count = 0
+    if fmt == "ndjson":
+        with open(output, "wb") as f:
+            for rows in chunks:
+                f.write(ndjson_block(rows))
+                count += len(rows)
+        return count
+
+    pa = _require_pyarrow()
+    schema = arrow_schema()
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(str(output), schema, compression="zstd")
+    elif fmt == "arrow":
+        writer = pa.ipc.new_stream(str(output), schema)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    try:
+        for rows in chunks:
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+            count += len(rows)
+    finally:
+        writer.close()
+    return count
+
+
+def read_archive(path: Path, fmt: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """Yield row chunks from an export file"""
+    if fmt == "ndjson":
+        with open(path, "r", encoding="utf-8") as f:
+            rows = []
+            for line in f:
+                if line.strip():
+                    rows.append(json.loads(line))
+                if len(rows) >= chunk_size:
+                    yield rows
+                    rows = []
+            if rows:
+                yield rows
+        return
+
+    pa = _require_pyarrow()
+    if fmt == "parquet":
+        for batch in pa.parquet.ParquetFile(str(path)).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+    elif fmt == "arrow":
+        with pa.OSFile(str(path), "rb") as source:
+            for batch in pa.ipc.open_stream(source):
+                yield batch.to_pylist()
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+def _record_from_row(row: Dict, keep_ids: bool) -> Dict:
+    if not row.get("plan_json"):
+        raise ValueError(f"Archived row {row.get('id')} has no plan_json")
+    record = {
+        "user_id": row["user_id"],
+        "age": row["age"],
+        "weight_kg": row["weight_kg"],
+        "calories_limit": row["calories_limit"],
+        "food_type": row["food_type"],
+        "plan_json": row["plan_json"],
+    }
+    # executemany needs the same keys in every row, so always set created_at
+    created_at = row.get("created_at")
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    record["created_at"] = created_at or datetime.now(timezone.utc)
+    if keep_ids:
+        record["id"] = row["id"]
+    return record
+
+
+def import_chunks(db: Session, chunks: Iterable[List[Dict]], keep_ids: bool = False) -> int:
+    """Insert archived rows with one executemany and commit per chunk; returns rows inserted"""
+    table = MealPlan.__table__
+    count = 0
+    for rows in chunks:
+        if not rows:
+            continue
+        db.execute(insert(table), [_record_from_row(row, keep_ids) for row in rows])
+        db.commit()
+        count += len(rows)
+    return count
+
+
+def _format_from_path(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".arrow", ".arrows", ".ipc"):
+        return "arrow"
+    return "ndjson"
+
+
+def _sample_plan() -> Dict:
+    """Representative plan used to generate benchmark rows"""
+    nutrition = {nutrient: 12.34 for nutrient in NUTRIENT_FIELDS}
+    plan = {"total_calories": 1950, "total_nutrition": dict(nutrition), "meal_breakdown": {}}
+    for meal in MEAL_TYPES:
+        plan[meal] = [
+            {"name": f"{meal.title()} dish {i}", "calories": 200, "serving_size": 100.0, "nutrition": dict(nutrition)}
+            for i in range(3)
+        ]
+        plan["meal_breakdown"][meal] = {"calories": 600, "target_calories": 650, "nutrition": dict(nutrition)}
+    plan["daily_targets"] = {"calories": 2000, "protein": 70.0}
+    return plan
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark(rows: int, chunk_size: int, fmt: str):
+    """Import `rows` synthetic plans into a scratch SQLite DB, export them back and report rows/sec"""
+    plan_json = encode_plan_json(_sample_plan())
+    created_at = datetime(2024, 1, 1)
+
+    def synthetic_chunks() -> Iterator[List[Dict]]:
+        for start in range(0, rows, chunk_size):
+            yield [
+                {"user_id": i % 1000, "age": 20 + i % 50, "weight_kg": 50.0 + i % 60,
+                 "calories_limit": 1200 + (i % 20) * 100, "food_type": "veg" if i % 2 else "nonveg",
+                 "created_at": created_at, "plan_json": plan_json}
+                for i in range(start, min(start + chunk_size, rows))
+            ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = BenchSession()
+        try:
+            started = time.perf_counter()
+            imported = import_chunks(db, synthetic_chunks())
+            import_seconds = time.perf_counter() - started
+
+            output = Path(tmp) / f"export.{fmt}"
+            started = time.perf_counter()
+            exported = write_export(iter_plan_chunks(db, chunk_size), output, fmt)
+            export_seconds = time.perf_counter() - started
+            size_mb = output.stat().st_size / 1024 / 1024
+        finally:
+            db.close()
+            engine.dispose()
+
+    print(f"import: {imported} rows in {import_seconds:.1f}s ({imported / import_seconds:,.0f} rows/s)")
+    print(f"export ({fmt}): {exported} rows in {export_seconds:.1f}s "
+          f"({exported / export_seconds:,.0f} rows/s, {size_mb:.1f} MB)")
+    peak = _peak_rss_mb()
+    if peak is not None:
+        print(f"peak RSS: {peak:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk export/import of meal plan records")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="stream meal_plans to a file")
+    export_parser.add_argument("--output", type=Path, required=True)
+    export_parser.add_argument("--format", choices=FORMATS, help="defaults to the output file extension")
+    export_parser.add_argument("--user-id", type=int, help="only export this user's plans")
+    export_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    import_parser = subparsers.add_parser("import", help="load an export file back into meal_plans")
+    import_parser.add_argument("--input", type=Path, required=True)
+    import_parser.add_argument("--format", choices=FORMATS, help="defaults to the input file extension")
+    import_parser.add_argument("--keep-ids", action="store_true", help="reuse archived primary keys")
+    import_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    bench_parser = subparsers.add_parser("bench", help="measure import/export throughput")
+    bench_parser.add_argument("--rows", type=int, default=1_000_000)
+    bench_parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    bench_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        benchmark(args.rows, args.chunk_size, args.format)
+        return
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if args.command == "export":
+            fmt = args.format or _format_from_path(args.output)
+            count = write_export(iter_plan_chunks(db, args.chunk_size, args.user_id), args.output, fmt)
+            print(f"Exported {count} meal plans to {args.output}", end="")
+        else:
+            fmt = args.format or _format_from_path(args.input)
+            count = import_chunks(db, read_archive(args.input, fmt, args.chunk_size), keep_ids=args.keep_ids)
+            print(f"Imported {count} meal plans from {args.input}", end="")
+        print(f" in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import json
+import mmap
+import os
+import random
+import struct
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .data_loader import food_data_loader
+from .models import FoodTypeEnum
+from .meal_logic import generate_meal_plan, daily_protein_requirement, MEAL_DISTRIBUTION
+
+# Table file layout: MAGIC, little-endian u64 header length, JSON header, plan blobs.
+# The header maps profile keys to [offset, length] pairs into the blob section and
+# records the content hash of the catalog the plans were solved against.
+MAGIC = b"SDPLAN1\0"
+_HEADER_LEN = struct.Struct("<Q")
+
+# A solved plan depends only on the calorie limit, food type and daily protein
+# requirement (weight and gender); age, height and activity level do not change it.
+# Profiles are keyed on a calorie bucket, the food type and a protein band.
+CALORIE_BUCKET_SIZE = 100
+PROTEIN_BAND_SIZE = 10
+
+# Each build is written to its own file, <stem>.<timestamp><suffix> next to this path,
+# so a table that a running server still has mapped is never overwritten (which
+# fails on Windows); the server maps the newest build at startup.
+DEFAULT_TABLE_PATH = Path(__file__).parent.parent / "plan_table.bin"
+
+
+def calorie_bucket(calories_limit: int) -> int:
+    """Round down to the bucket so a stored plan never exceeds the requested limit"""
+    return calories_limit // CALORIE_BUCKET_SIZE * CALORIE_BUCKET_SIZE
+
+
+def protein_band(protein_g: float) -> int:
+    """Round a daily protein requirement to the nearest band"""
+    return int(round(protein_g / PROTEIN_BAND_SIZE)) * PROTEIN_BAND_SIZE
+
+
+def profile_key(calories_limit: int, food_type: str, protein_g: float) -> str:
+    """Table key for a request profile"""
+    food_type = food_type.value if isinstance(food_type, FoodTypeEnum) else food_type
+    return f"{calorie_bucket(calories_limit)}|{food_type}|{protein_band(protein_g)}"
+
+
+def solve_profile(bucket: int, food_type: str, band: int) -> Dict:
+    """Run the live solver for a profile at its bucket's calorie limit and band's protein requirement"""
+    # Male requirement is 1 g protein per kg, so the band value doubles as the body weight
+    return generate_meal_plan(
+        age=30,
+        weight_kg=float(band),
+        calories_limit=bucket,
+        food_type=FoodTypeEnum(food_type),
+        gender="male",
+    )
+
+
+def versioned_table_path(path: Path) -> Path:
+    """File name for a new build of the table at `path`"""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    return path.with_name(f"{path.stem}.{stamp}{path.suffix}")
+
+
+def table_versions(path: Path) -> List[Path]:
+    """Builds of the table at `path`, oldest first"""
+    return sorted(path.parent.glob(f"{path.stem}.*{path.suffix}"))
+
+
+def resolve_table_path(path: Path) -> Optional[Path]:
+    """Newest build of the table at `path`, or `path` itself when there are none"""
+    versions = table_versions(path)
+    if versions:
+        return versions[-1]
+    return path if path.exists() else None
+
+
+def remove_old_versions(path: Path, keep: Path) -> int:
+    """Delete builds other than `keep`; returns how many were removed"""
+    removed = 0
+    for old in table_versions(path):
+        if old == keep:
+            continue
+        try:
+            old.unlink()
+            removed += 1
+        except OSError:
+            pass  # still mapped by a running server (Windows); a later run removes it
+    return removed
+
+
+def write_plan_table(path: Path, profiles: Dict[str, List[Dict]], catalog_hash: Optional[str]) -> int:
+    """
+    Write profile alternatives solved against the catalog with `catalog_hash`
+    to `path` (atomically via a temp file). Returns the number of plans written.
+    """
+    blobs = []
+    index = {}
+    offset = 0
+    for key, plans in profiles.items():
+        entries = []
+        for plan in plans:
+            blob = json.dumps(plan, separators=(",", ":")).encode("utf-8")
+            blobs.append(blob)
+            entries.append([offset, len(blob)])
+            offset += len(blob)
+        if entries:
+            index[key] = entries
+
+    header = json.dumps({"bucket_size": CALORIE_BUCKET_SIZE, "protein_band_size": PROTEIN_BAND_SIZE,
+                         "catalog_hash": catalog_hash, "profiles": index},
+                        separators=(",", ":")).encode("utf-8")
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return len(blobs)
+
+
+class PlanTable:
+    """Read-only, memory-mapped table of precomputed plans"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a plan table")
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        (header_len,) = _HEADER_LEN.unpack(self._mm[len(MAGIC):header_start])
+        header = json.loads(self._mm[header_start:header_start + header_len])
+        if (header.get("bucket_size"), header.get("protein_band_size")) != (CALORIE_BUCKET_SIZE, PROTEIN_BAND_SIZE):
+            self._mm.close()
+            raise ValueError(f"{self.path} uses bucket/band sizes {header.get('bucket_size')}/"
+                             f"{header.get('protein_band_size')}, expected {CALORIE_BUCKET_SIZE}/{PROTEIN_BAND_SIZE}")
+        self.catalog_hash: Optional[str] = header.get("catalog_hash")
+        self._profiles: Dict[str, List[List[int]]] = header["profiles"]
+        self._data_start = header_start + header_len
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def matches_catalog(self, catalog_hash: str) -> bool:
+        """True when the stored plans were solved against the catalog with this content hash"""
+        return self.catalog_hash is not None and self.catalog_hash == catalog_hash
+
+    def lookup(self, key: str, rng: Optional[random.Random] = None) -> Optional[Dict]:
+        """A random stored alternative for the profile, or None if it is not in the table"""
+        entries = self._profiles.get(key)
+        if not entries:
+            return None
+        offset, length = (rng or random).choice(entries)
+        start = self._data_start + offset
+        return json.loads(self._mm[start:start + length])
+
+
+class PlanTableStats:
+    """Hit/miss counters for precomputed plan lookups (stale-table skips count as misses)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def record(self, hit: bool, stale: bool = False):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if stale:
+                    self.stale += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            hits, misses, stale = self.hits, self.misses, self.stale
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "stale": stale,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+
+def _load_plan_table() -> Optional[PlanTable]:
+    base_path = Path(os.getenv("PLAN_TABLE_PATH", str(DEFAULT_TABLE_PATH)))
+    path = resolve_table_path(base_path)
+    if path is None:
+        print(f"No precomputed plan table at {base_path}, all plans will be solved live")
+        return None
+    try:
+        table = PlanTable(path)
+    except Exception as e:
+        print(f"Error loading plan table {path}: {e}")
+        return None
+    print(f"Loaded precomputed plans for {len(table)} profiles from {path}")
+    return table
+
+
+def _adapt_plan(plan: Dict, calories_limit: int, weight_kg: float, gender: str) -> Dict:
+    """Replace the stored plan's targets with the ones for this request"""
+    plan["daily_targets"] = {
+        "calories": calories_limit,
+        "protein": daily_protein_requirement(weight_kg, gender),
+    }
+    for meal_type, breakdown in plan.get("meal_breakdown", {}).items():
+        if meal_type in MEAL_DISTRIBUTION:
+            breakdown["target_calories"] = int(calories_limit * MEAL_DISTRIBUTION[meal_type]["calorie_ratio"])
+    return plan
+
+
+def lookup_or_solve(age: int, weight_kg: float, calories_limit: int, food_type: FoodTypeEnum,
+                    height_cm: float = 170, gender: str = "male", activity_level: str = "moderate",
+                    seed: Optional[int] = None) -> Tuple[Dict, bool, bool]:
+    """
+    Serve a plan from the precomputed table when the request profile is in it
+    and the table was built from the live catalog, otherwise solve it live with
+    generate_meal_plan. A seed makes the choice of alternative / sampled options
+    reproducible. Returns (plan, table hit, table stale); stats are left to the caller.
+    """
+    rng = random.Random(seed) if seed is not None else None
+    stale = False
+    # Without a gender there is no protein requirement to key on; solve live as before
+    if plan_table is not None and gender is not None:
+        stale = not plan_table.matches_catalog(food_data_loader.catalog.content_hash)
+        if not stale:
+            protein = daily_protein_requirement(weight_kg, gender)
+            plan = plan_table.lookup(profile_key(calories_limit, food_type, protein), rng=rng)
+            if plan is not None:
+                return _adapt_plan(plan, calories_limit, weight_kg, gender), True, False
+
+    plan = generate_meal_plan(
+        age=age,
+        weight_kg=weight_kg,
+        calories_limit=calories_limit,
+        food_type=food_type,
+        height_cm=height_cm,
+        gender=gender,
+        activity_level=activity_level,
+        rng=rng,
+    )
+    return plan, False, stale
+
+
+def get_meal_plan(age: int, weight_kg: float, calories_limit: int, food_type: FoodTypeEnum,
+                  height_cm: float = 170, gender: str = "male", activity_level: str = "moderate",
+                  seed: Optional[int] = None) -> Dict:
+    """lookup_or_solve for a single request, recording the table hit/miss"""
+    plan, hit, stale = lookup_or_solve(age, weight_kg, calories_limit, food_type, height_cm=height_cm,
+                                       gender=gender, activity_level=activity_level, seed=seed)
+    plan_table_stats.record(hit=hit, stale=stale)
+    return plan
+
+
+# Global table and metrics, memory-mapped once at startup
+plan_table = _load_plan_table()
+plan_table_stats = PlanTableStats()
@@ -0,0 +1,117 @@
+"""
+Offline job that solves the most common request profiles and writes the
+precomputed plan table served by /api/meal/generate.
+
+Usage (from backend/):
+    python -m app.precompute_plans --top-k 40 --alternatives 8
+"""
+import argparse
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Tuple
+
+from sqlalchemy import func
+
+from .data_loader import food_data_loader
+from .db import SessionLocal
+from .models import MealPlan
+from .meal_logic import daily_protein_requirement
+from .plan_table import (
+    DEFAULT_TABLE_PATH, calorie_bucket, profile_key, protein_band, remove_old_versions, solve_profile,
+    versioned_table_path, write_plan_table,
+)
+
+GENDERS = ["male", "female"]
+
+# Used when there is no request history yet
+DEFAULT_BUCKETS = [1500, 1800, 2000, 2200, 2500]
+DEFAULT_WEIGHTS_KG = [55, 65, 75, 85]
+
+
+def rank_profiles(top_k: int, genders: List[str]) -> List[Tuple[int, str, int]]:
+    """
+    Most common (calorie bucket, food_type, protein band) profiles in meal plan
+    history. History does not record gender, so each row's weight counts towards
+    the protein band of every given gender.
+    """
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(MealPlan.calories_limit, MealPlan.food_type, MealPlan.weight_kg, func.count(MealPlan.id))
+            .group_by(MealPlan.calories_limit, MealPlan.food_type, MealPlan.weight_kg)
+            .all()
+        )
+    finally:
+        db.close()
+
+    if not rows:
+        rows = [(bucket, food_type, weight_kg, 1)
+                for bucket in DEFAULT_BUCKETS
+                for food_type in ("veg", "nonveg")
+                for weight_kg in DEFAULT_WEIGHTS_KG]
+
+    counts = Counter()
+    for calories_limit, food_type, weight_kg, count in rows:
+        food_type = getattr(food_type, "value", food_type)
+        for gender in genders:
+            band = protein_band(daily_protein_requirement(weight_kg, gender))
+            counts[(calorie_bucket(calories_limit), food_type, band)] += count
+    return [profile for profile, _ in counts.most_common(top_k)]
+
+
+def precompute(top_k: int, alternatives: int, genders: List[str], output: Path):
+    profiles = rank_profiles(top_k, genders)
+    catalog_hash = food_data_loader.catalog.content_hash
+    print(f"Solving {len(profiles)} profiles x {alternatives} alternatives")
+
+    table = {}
+    started = time.perf_counter()
+    for bucket, food_type, band in profiles:
+        plans = []
+        seen = set()
+        # Solver samples options randomly; retry a few times to collect distinct plans
+        for _ in range(alternatives * 3):
+            plan = solve_profile(bucket, food_type, band)
+            if "error" in plan:
+                continue
+            signature = json.dumps([[item["name"] for item in plan[meal]] for meal in ("breakfast", "lunch", "dinner")])
+            if signature in seen:
+                continue
+            seen.add(signature)
+            plans.append(plan)
+            if len(plans) >= alternatives:
+                break
+        table[profile_key(bucket, food_type, band)] = plans
+
+    if food_data_loader.catalog.content_hash != catalog_hash:
+        raise RuntimeError("Food catalog changed while precomputing plans, run the job again")
+    path = versioned_table_path(output)
+    written = write_plan_table(path, table, catalog_hash)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {written} plans for {len(table)} profiles to {path} in {elapsed:.1f}s")
+    removed = remove_old_versions(output, keep=path)
+    if removed:
+        print(f"Removed {removed} older plan table build(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute meal plans for the most common request profiles")
+    parser.add_argument("--top-k", type=int, default=40, help="number of profiles to precompute")
+    parser.add_argument("--alternatives", type=int, default=8, help="distinct plans stored per profile")
+    parser.add_argument("--genders", default=",".join(GENDERS),
+                        help="genders whose protein requirement is derived from historical weights")
+    parser.add_argument("--output", type=Path, default=DEFAULT_TABLE_PATH)
+    args = parser.parse_args()
+
+    precompute(
+        top_k=args.top_k,
+        alternatives=args.alternatives,
+        genders=[g.strip() for g in args.genders.split(",") if g.strip()],
+        output=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+
+from .security import get_current_user
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    Parse "<requests>/<seconds>" (e.g. "20/60") into (bucket capacity, tokens refilled per second).
+    """
+    requests, _, seconds = rate.partition("/")
+    capacity = int(requests)
+    period = float(seconds or 1)
+    if capacity <= 0 or period <= 0:
+        raise ValueError(f"Invalid rate limit: {rate}")
+    return capacity, capacity / period
+
+
+class InMemoryRateLimiterBackend:
+    """Token buckets kept in process memory (per worker)"""
+
+    # Seconds between sweeps that drop buckets which have refilled completely
+    PRUNE_INTERVAL = 60.0
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (tokens, updated, full_at); full_at is when the bucket is back at its own capacity
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._last_prune = clock()
+
+    def _prune(self, now: float):
+        # A full bucket is equivalent to a missing one, so dropping it never resets a limit
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        self._last_prune = now
+
+    def acquire(self, key: str, capacity: int, refill_rate: float, cost: float = 1) -> Tuple[bool, float]:
+        """Take `cost` tokens from the bucket; returns (allowed, seconds until enough tokens)"""
+        now = self._clock()
+        with self._lock:
+            if now - self._last_prune >= self.PRUNE_INTERVAL:
+                self._prune(now)
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            if tokens >= cost:
+                tokens -= cost
+                allowed, retry_after = True, 0.0
+            else:
+                allowed, retry_after = False, (cost - tokens) / refill_rate
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / refill_rate)
+        return allowed, retry_after
+
+
+class RedisRateLimiterBackend:
+    """Token buckets shared by all workers through Redis (requires the `redis` package)"""
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local refill_rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill_rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry_after = (cost - tokens) / refill_rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from e
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+        self.prefix = prefix
+
+    def acquire(self, key: str, capacity: int, refill_rate: float, cost: float = 1) -> Tuple[bool, float]:
+        allowed, retry_after = self._script(
+            keys=[self.prefix + key],
+            args=[capacity, refill_rate, time.time(), cost],
+        )
+        return bool(allowed), float(retry_after)
+
+
+def _backend_from_env():
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    if backend == "memory":
+        return InMemoryRateLimiterBackend()
+    if backend == "redis":
+        return RedisRateLimiterBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+
+class RateLimiter:
+    """Token-bucket limit for one endpoint scope, stored in a pluggable backend"""
+
+    def __init__(self, scope: str, rate: str, backend=None):
+        self.scope = scope
+        self.capacity, self.refill_rate = parse_rate(rate)
+        self.backend = backend if backend is not None else rate_limit_backend
+
+    def check(self, key: str):
+        """Consume one token for `key` or raise 429 with Retry-After"""
+        allowed, retry_after = self.backend.acquire(f"{self.scope}:{key}", self.capacity, self.refill_rate)
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded, try again later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def limit_per_user(limiter: RateLimiter):
+    """Dependency that rate limits by authenticated user id and returns the user"""
+    def dependency(user=Depends(get_current_user)):
+        limiter.check(f"user:{user.id}")
+        return user
+    return dependency
+
+
+def limit_per_ip(limiter: RateLimiter):
+    """Dependency that rate limits by client IP"""
+    def dependency(request: Request):
+        limiter.check(f"ip:{client_ip(request)}")
+    return dependency
+
+
+# Shared backend for all limiters in this process
+rate_limit_backend = _backend_from_env()
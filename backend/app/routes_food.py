@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Query
+
+from .schemas import FoodSearchResponse
+from .data_loader import food_data_loader
+from .routes_meal import replace_nan_with_none
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=FoodSearchResponse)
+def search_foods(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+):
+    """Typeahead search over dish names (prefix matches first, then fuzzy matches)"""
+    results = food_data_loader.search_foods(q, limit=limit)
+    return {"query": q, "results": replace_nan_with_none(results)}
@@ -1,16 +1,33 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-import json
+from typing import Dict, Literal, Optional
 import math
+import os
 
-from .db import get_db
+from .db import get_db, SessionLocal
 from .models import MealPlan, FoodTypeEnum
 from .schemas import MealGenerateRequest, MealPlanResponse
 from .security import get_current_user
-from .meal_logic import generate_meal_plan
+from .plan_table import lookup_or_solve, plan_table, plan_table_stats
+from .plan_codec import COMPACT_MEDIA_TYPE, compact_plan, encode_plan_json, wants_compact
+from .rate_limit import RateLimiter, limit_per_user, limit_per_ip
+from .single_flight import SingleFlight
+from .plan_export import DEFAULT_CHUNK_SIZE, iter_plan_chunks, ndjson_lines
 
 router = APIRouter()
 
+generate_limiter = RateLimiter("generate", os.getenv("RATE_LIMIT_GENERATE", "20/60"))
+generate_test_limiter = RateLimiter("generate-test", os.getenv("RATE_LIMIT_GENERATE_TEST", "5/60"))
+
+# Identical concurrent plan requests share one solve
+plan_flight = SingleFlight()
+
+# Users allowed to export every user's plans (comma separated emails)
+EXPORT_ADMIN_EMAILS = {
+    email.strip().lower() for email in os.getenv("EXPORT_ADMIN_EMAILS", "").split(",") if email.strip()
+}
+
 def replace_nan_with_none(data):
     """Recursively replace NaN and infinity values with None for JSON serialization."""
     if isinstance(data, dict):
@@ -22,9 +39,11 @@ def replace_nan_with_none(data):
     return data
 
 
-@router.post("/generate", response_model=MealPlanResponse)
-def generate(payload: MealGenerateRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    plan = generate_meal_plan(
+def _solve(payload: MealGenerateRequest) -> Dict:
+    """Generate a plan, coalescing with an identical in-flight request if there is one"""
+    # Validated fields are already type-normalized (e.g. 70 -> 70.0), seed included
+    key = tuple(sorted(payload.model_dump().items()))
+    plan, hit, stale = plan_flight.do(key, lambda: lookup_or_solve(
         age=payload.age,
         weight_kg=payload.weight_kg,
         calories_limit=payload.calories_limit,
@@ -32,7 +51,29 @@ def generate(payload: MealGenerateRequest, db: Session = Depends(get_db), user=D
         height_cm=payload.height_cm,
         gender=payload.gender,
         activity_level=payload.activity_level,
-    )
+        seed=payload.seed,
+    ))
+    # Recorded per request, so coalesced requests count towards the hit rate too
+    plan_table_stats.record(hit=hit, stale=stale)
+    return plan
+
+
+def _plan_response(plan: Dict, accept: Optional[str], format: Optional[str]):
+    """Return the plan as-is, or as a compact payload when the client negotiated it"""
+    if wants_compact(accept, format):
+        return JSONResponse(compact_plan(plan), media_type=COMPACT_MEDIA_TYPE)
+    return plan
+
+
+@router.post("/generate", response_model=MealPlanResponse)
+def generate(
+    payload: MealGenerateRequest,
+    db: Session = Depends(get_db),
+    user=Depends(limit_per_user(generate_limiter)),
+    format: Optional[Literal["full", "compact"]] = Query(default=None),
+    accept: Optional[str] = Header(default=None),
+):
+    plan = _solve(payload)
 
     # ✅ Clean NaN/inf values before saving and returning
     clean_plan = replace_nan_with_none(plan)
@@ -43,25 +84,61 @@ def generate(payload: MealGenerateRequest, db: Session = Depends(get_db), user=D
         weight_kg=payload.weight_kg,
         calories_limit=payload.calories_limit,
         food_type=FoodTypeEnum(payload.food_type),
-        plan_json=json.dumps(clean_plan),
+        plan_json=encode_plan_json(clean_plan),
     )
     db.add(record)
     db.commit()
-    return clean_plan
+    return _plan_response(clean_plan, accept, format)
 
 
 @router.post("/generate-test", response_model=MealPlanResponse)
-def generate_test(payload: MealGenerateRequest):
+def generate_test(
+    payload: MealGenerateRequest,
+    _rate_limit=Depends(limit_per_ip(generate_test_limiter)),
+    format: Optional[Literal["full", "compact"]] = Query(default=None),
+    accept: Optional[str] = Header(default=None),
+):
     """Test endpoint for meal generation without authentication"""
-    plan = generate_meal_plan(
-        age=payload.age,
-        weight_kg=payload.weight_kg,
-        calories_limit=payload.calories_limit,
-        food_type=FoodTypeEnum(payload.food_type),
-        height_cm=payload.height_cm,
-        gender=payload.gender,
-        activity_level=payload.activity_level,
-    )
+    plan = _solve(payload)
 
     # ✅ Clean NaN/inf values before returning
-    return replace_nan_with_none(plan)
+    return _plan_response(replace_nan_with_none(plan), accept, format)
+
+
+@router.get("/stats")
+def stats():
+    """Precomputed plan table hit rate and request coalescing metrics"""
+    return {
+        "plan_table": {
+            "loaded": plan_table is not None,
+            "profiles": len(plan_table) if plan_table is not None else 0,
+            **plan_table_stats.snapshot(),
+        },
+        "coalesced_requests": plan_flight.coalesced,
+    }
+
+
+@router.get("/export")
+def export_plans(
+    user=Depends(get_current_user),
+    chunk_size: int = Query(default=DEFAULT_CHUNK_SIZE, ge=100, le=50000),
+):
+    """
+    Stream saved meal plans as newline-delimited JSON with flattened nutrient columns.
+    Export admins get every user's plans, other users their own.
+    """
+    user_id = None if user.email.lower() in EXPORT_ADMIN_EMAILS else user.id
+
+    def stream():
+        # Own session: the request-scoped one is closed before the body is streamed
+        db = SessionLocal()
+        try:
+            yield from ndjson_lines(iter_plan_chunks(db, chunk_size, user_id))
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="meal_plans.ndjson"'},
+    )
@@ -25,6 +25,7 @@ class MealGenerateRequest(BaseModel):
     activity_level: Optional[ActivityLevel] = Field(default="moderate")
     calories_limit: int = Field(ge=800, le=5000)
     food_type: FoodType
+    seed: Optional[int] = Field(default=None, ge=0)  # makes the generated plan reproducible
 
 class NutritionInfo(BaseModel):
     protein: float = 0
@@ -58,3 +59,14 @@ class MealPlanResponse(BaseModel):
     meal_breakdown: Optional[Dict[str, MealBreakdown]] = None
     daily_targets: Optional[Dict] = None
     nutritional_analysis: Optional[Dict] = None
+
+class FoodSearchItem(BaseModel):
+    id: int
+    name: str
+    calories: int
+    serving_size: Optional[float] = 100  # in grams
+    nutrition: Optional[NutritionInfo] = None
+
+class FoodSearchResponse(BaseModel):
+    query: str
+    results: List[FoodSearchItem]
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Keep tests away from the checked-in smart_diet.db and any local plan table
+_tmp = tempfile.mkdtemp(prefix="smart-diet-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(_tmp) / 'test.db'}")
+os.environ.setdefault("PLAN_TABLE_PATH", str(Path(_tmp) / "missing_plan_table.bin"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,81 @@
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.compression import CompressionMiddleware, choose_encoding
+
+BIG = {"items": [{"name": f"Dish {i}", "calories": i} for i in range(200)]}
+
+
+def _app():
+    async def big(request):
+        return JSONResponse(BIG)
+
+    async def small(request):
+        return JSONResponse({"ok": True})
+
+    async def binary(request):
+        return Response(b"\x00" * 5000, media_type="image/png")
+
+    async def stream(request):
+        async def lines():
+            for i in range(500):
+                yield json.dumps({"row": i}) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    async def encoded(request):
+        body = gzip.compress(b"x" * 5000)
+        return PlainTextResponse(body, headers={"Content-Encoding": "gzip"})
+
+    app = Starlette(routes=[
+        Route("/big", big), Route("/small", small), Route("/binary", binary),
+        Route("/stream", stream), Route("/encoded", encoded),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+client = _app()
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("") is None
+
+
+def test_large_json_is_gzipped():
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(json.dumps(BIG))
+    assert response.json() == BIG
+
+
+def test_not_compressed_without_accept_encoding():
+    response = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == BIG
+
+
+def test_small_and_binary_responses_pass_through():
+    for path in ("/small", "/binary"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+
+def test_already_encoded_response_is_not_compressed_twice():
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == b"x" * 5000
+
+
+def test_streaming_response_is_compressed():
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    lines = response.text.splitlines()
+    assert len(lines) == 500 and json.loads(lines[-1]) == {"row": 499}
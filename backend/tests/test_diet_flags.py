@@ -0,0 +1,96 @@
+import pandas as pd
+
+from app.data_loader import IndianFoodDataLoader
+from app.diet_flags import DIET_FLAG_COLUMNS, apply_diet_overrides, compute_diet_flags
+from app.food_index import normalize_dish_name
+
+DISHES = [
+    "Paneer curry",
+    "Eggplant/Brinjal rice (Vangi bhat)",
+    "Egg sandwich (Ande ka sandwich)",
+    "Mayonnaise without eggs",
+    "Chicken biryani/biriyani",
+    "Aloo paratha",
+    "Dal makhani",
+]
+
+
+def _catalog(names=DISHES) -> pd.DataFrame:
+    df = pd.DataFrame({"Dish Name": names})
+    df["Name Key"] = df["Dish Name"].map(normalize_dish_name)
+    return compute_diet_flags(df)
+
+
+def _flags(df: pd.DataFrame, name: str) -> dict:
+    row = df[df["Dish Name"] == name].iloc[0]
+    return {flag: bool(row[column]) for flag, column in DIET_FLAG_COLUMNS.items()}
+
+
+def test_flags_match_whole_words_only():
+    df = _catalog()
+    assert _flags(df, "Eggplant/Brinjal rice (Vangi bhat)")["veg"]
+    assert _flags(df, "Egg sandwich (Ande ka sandwich)")["egg"]
+    assert not _flags(df, "Egg sandwich (Ande ka sandwich)")["veg"]
+    assert _flags(df, "Mayonnaise without eggs")["vegan"]
+    assert _flags(df, "Chicken biryani/biriyani")["nonveg"]
+
+
+def test_vegan_and_jain_are_subsets_of_veg():
+    df = _catalog()
+    assert _flags(df, "Paneer curry") == {
+        "nonveg": False, "egg": False, "veg": True, "vegan": False, "jain": True,
+    }
+    assert not _flags(df, "Aloo paratha")["jain"]
+    assert not _flags(df, "Dal makhani")["vegan"]
+
+
+def test_override_rederives_dependent_flags(tmp_path):
+    overrides = tmp_path / "overrides.csv"
+    overrides.write_text("Dish Name,nonveg\nPaneer curry,true\n", encoding="utf-8")
+
+    df = apply_diet_overrides(_catalog(), overrides)
+
+    assert _flags(df, "Paneer curry") == {
+        "nonveg": True, "egg": False, "veg": False, "vegan": False, "jain": False,
+    }
+
+
+def test_override_can_make_a_dish_vegetarian(tmp_path):
+    overrides = tmp_path / "overrides.csv"
+    overrides.write_text("Dish Name,Is Non Veg\nChicken biryani/biriyani,false\n", encoding="utf-8")
+
+    df = apply_diet_overrides(_catalog(), overrides)
+
+    flags = _flags(df, "Chicken biryani/biriyani")
+    assert flags["veg"] and flags["vegan"] and flags["jain"]
+
+
+def test_explicit_dependent_flags_are_kept(tmp_path):
+    overrides = tmp_path / "overrides.csv"
+    overrides.write_text("Dish Name,egg,jain\nEggplant/Brinjal rice (Vangi bhat),true,\n"
+                         "Aloo paratha,,true\n", encoding="utf-8")
+
+    df = apply_diet_overrides(_catalog(), overrides)
+
+    assert not _flags(df, "Eggplant/Brinjal rice (Vangi bhat)")["veg"]
+    assert _flags(df, "Aloo paratha")["jain"]
+
+
+def test_overridden_dish_is_excluded_from_veg_foods(tmp_path):
+    source = tmp_path / "foods.csv"
+    source.write_text(
+        "Dish Name,Calories (kcal),Carbohydrates (g),Protein (g),Fats (g),Free Sugar (g),"
+        "Fibre (g),Sodium (mg),Calcium (mg),Iron (mg),Vitamin C (mg),Folate (µg)\n"
+        "Paneer curry,176.52,8.4,7.8,12.38,6.29,1.4,216.09,189.06,0.81,20.04,95.56\n"
+        "Dal makhani,150,10,6,8,1,3,300,40,2,1,20\n",
+        encoding="utf-8",
+    )
+    overrides = tmp_path / "overrides.csv"
+    overrides.write_text("Dish Name,nonveg\nPaneer curry,true\n", encoding="utf-8")
+
+    loader = IndianFoodDataLoader(sources=[source], overrides_path=overrides)
+
+    veg_names = {name for items in loader.get_vegetarian_foods().values() for name, *_ in items}
+    jain_names = {name for items in loader.get_foods_by_flag('jain').values() for name, *_ in items}
+    assert "Paneer curry" not in veg_names | jain_names
+    assert "Dal makhani" in veg_names
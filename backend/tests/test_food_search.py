@@ -0,0 +1,115 @@
+from fastapi.testclient import TestClient
+
+from app import data_loader
+from app.data_loader import IndianFoodDataLoader, food_data_loader
+from app.food_index import FoodSearchIndex
+from app.main import app
+
+client = TestClient(app)
+
+NAMES = [
+    "Dal makhani",
+    "Dalma",
+    "Moong dal khichdi",
+    "Chicken biryani/biriyani",
+    "Paneer shaslik/tikka",
+    "Hot tea (Garam Chai)",
+]
+
+HEADER = ("Dish Name,Calories (kcal),Carbohydrates (g),Protein (g),Fats (g),Free Sugar (g),"
+          "Fibre (g),Sodium (mg),Calcium (mg),Iron (mg),Vitamin C (mg),Folate (µg)\n")
+
+
+def _names(index, query, limit=10):
+    return [index.names[i] for i in index.search(query, limit=limit)]
+
+
+def test_prefix_matches_rank_leading_match_first():
+    index = FoodSearchIndex(NAMES)
+    results = _names(index, "dal")
+    assert results[:2] == ["Dalma", "Dal makhani"]
+    assert "Moong dal khichdi" in results
+
+
+def test_every_query_token_must_prefix_a_name_token():
+    index = FoodSearchIndex(NAMES)
+    assert _names(index, "paneer tik", limit=1) == ["Paneer shaslik/tikka"]
+
+
+def test_fuzzy_fallback_handles_typos():
+    index = FoodSearchIndex(NAMES)
+    assert _names(index, "biryni") == ["Chicken biryani/biriyani"]
+
+
+def test_empty_query_returns_nothing():
+    assert FoodSearchIndex(NAMES).search("  ") == []
+
+
+def test_search_endpoint_handles_dishes_with_missing_nutrients():
+    # 'White sauce' rows have no Vitamin C / Folate in the dataset
+    response = client.get("/api/foods/search", params={"q": "white sauce"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results and results[0]["name"].startswith("White sauce")
+    assert results[0]["nutrition"]["vitamin_c"] == 0
+
+
+def test_search_endpoint_ordinary_queries():
+    for query in ("dal", "egg"):
+        response = client.get("/api/foods/search", params={"q": query})
+        assert response.status_code == 200
+        assert response.json()["results"]
+
+
+def test_sources_are_merged_and_deduplicated_by_normalized_name(tmp_path):
+    base = tmp_path / "base.csv"
+    extra = tmp_path / "extra.csv"
+    base.write_text(HEADER + "Hot tea,16,2,0.4,0.5,2,0,3,14,0,0.5,1.8\n"
+                    "Dal makhani,150,10,6,8,1,3,300,40,2,1,20\n", encoding="utf-8")
+    extra.write_text(HEADER + "HOT  TEA,99,2,0.4,0.5,2,0,3,14,0,,\n", encoding="utf-8")
+
+    loader = IndianFoodDataLoader(sources=[base, extra])
+
+    assert len(loader.df) == 2
+    tea = loader.search_foods("hot tea", limit=1)[0]
+    assert tea["calories"] == 99  # later source wins
+    assert tea["nutrition"]["folate"] == 0
+
+
+def test_rows_without_numeric_calories_are_skipped(tmp_path, capsys):
+    base = tmp_path / "base.csv"
+    user = tmp_path / "user.csv"
+    base.write_text(HEADER + "Hot tea,16,2,0.4,0.5,2,0,3,14,0,0.5,1.8\n", encoding="utf-8")
+    user.write_text(HEADER + "Hot tea,,2,0.4,0.5,2,0,3,14,0,0.5,1.8\n"
+                    "Masala dosa,lots,30,5,8,1,2,300,40,1,2,20\n"
+                    "Dal makhani,150,10,6,8,1,3,300,40,2,1,20\n", encoding="utf-8")
+
+    loader = IndianFoodDataLoader(sources=[base, user])
+
+    assert "Skipping 2 row(s)" in capsys.readouterr().out
+    assert sorted(loader.df['Dish Name']) == ["Dal makhani", "Hot tea"]
+    assert loader.search_foods("hot tea", limit=1)[0]["calories"] == 16  # the valid base row is kept
+    assert loader.search_foods("dal", limit=1)[0]["calories"] == 150
+
+
+def test_changed_source_is_swapped_in_by_background_reload(tmp_path, monkeypatch):
+    source = tmp_path / "foods.csv"
+    source.write_text(HEADER + "Hot tea,16,2,0.4,0.5,2,0,3,14,0,0.5,1.8\n", encoding="utf-8")
+    loader = IndianFoodDataLoader(sources=[source])
+    monkeypatch.setattr(data_loader, "RELOAD_CHECK_INTERVAL", 0)
+
+    source.write_text(HEADER + "Hot tea,16,2,0.4,0.5,2,0,3,14,0,0.5,1.8\n"
+                      "Dal makhani,150,10,6,8,1,3,300,40,2,1,20\n", encoding="utf-8")
+    old = loader._catalog
+    assert loader.catalog is old  # readers get the current snapshot; the rebuild runs in the background
+    loader._reload_thread.join(timeout=10)
+
+    assert len(old.df) == 1
+    assert len(loader.catalog.df) == 2
+    assert loader.search_foods("dal makhani", limit=1)[0]["calories"] == 150
+
+
+def test_global_loader_categorizes_catalog():
+    categorized = food_data_loader.categorize_foods()
+    assert set(categorized) == {"breakfast", "lunch", "dinner"}
+    assert all(categorized.values())
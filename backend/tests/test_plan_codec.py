@@ -0,0 +1,57 @@
+import json
+import random
+
+import pytest
+
+from app import plan_codec
+from app.meal_logic import generate_meal_plan
+from app.models import FoodTypeEnum
+from app.plan_codec import (
+    COMPACT_MEDIA_TYPE, NUTRIENT_FIELDS, compact_plan, decode_plan_json, encode_plan_json, wants_compact,
+)
+
+
+@pytest.fixture(scope="module")
+def plan():
+    return generate_meal_plan(30, 70, 2000, FoodTypeEnum.nonveg, rng=random.Random(3))
+
+
+def test_wants_compact():
+    assert wants_compact(COMPACT_MEDIA_TYPE)
+    assert wants_compact(None, "compact")
+    assert not wants_compact(COMPACT_MEDIA_TYPE, "full")
+    assert not wants_compact("application/json")
+
+
+def test_compact_payload_references_foods_once(plan):
+    compact = compact_plan(plan)
+    assert compact["nutrients"] == NUTRIENT_FIELDS
+    assert len(json.dumps(compact)) < len(json.dumps(plan))
+
+    foods = compact["foods"]
+    for meal in ("breakfast", "lunch", "dinner"):
+        assert [foods[item_id]["name"] for item_id in compact[meal]] == [item["name"] for item in plan[meal]]
+        for item_id, original in zip(compact[meal], plan[meal]):
+            assert foods[item_id]["calories"] == original["calories"]
+            nutrition = dict(zip(compact["nutrients"], foods[item_id]["nutrition"]))
+            for nutrient, value in original["nutrition"].items():
+                assert nutrition[nutrient] == pytest.approx(value, abs=0.005)
+    assert compact["total_calories"] == plan["total_calories"]
+    assert compact["daily_targets"] == pytest.approx(plan["daily_targets"], abs=0.005)
+
+
+def test_stored_plan_json_is_lossless(plan):
+    stored = encode_plan_json(plan)
+    assert stored.startswith("z2:")
+    assert len(stored) < len(json.dumps(plan))
+    assert decode_plan_json(stored) == json.loads(json.dumps(plan))
+
+
+def test_uncompressed_storage(plan, monkeypatch):
+    monkeypatch.setattr(plan_codec, "COMPRESS_PLAN_JSON", False)
+    stored = encode_plan_json(plan)
+    assert json.loads(stored) == decode_plan_json(stored)
+
+
+def test_decodes_plain_json_rows(plan):
+    assert decode_plan_json(json.dumps(plan)) == json.loads(json.dumps(plan))
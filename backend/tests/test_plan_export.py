@@ -0,0 +1,96 @@
+import importlib.util
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import MealPlan
+from app.plan_codec import decode_plan_json, encode_plan_json
+from app.plan_export import (
+    EXPORT_COLUMNS, ITEM_SEPARATOR, _sample_plan, import_chunks, iter_plan_chunks, read_archive, write_export,
+)
+
+ROWS = 25
+
+PYARROW = pytest.mark.skipif(importlib.util.find_spec("pyarrow") is None, reason="pyarrow not installed")
+
+
+def _session(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _seed(db):
+    plan_json = encode_plan_json(_sample_plan())
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {"user_id": i % 3, "age": 20 + i, "weight_kg": 60.5, "calories_limit": 1800 + i,
+         "food_type": "veg" if i % 2 else "nonveg", "created_at": created_at, "plan_json": plan_json}
+        for i in range(ROWS)
+    ]
+    return import_chunks(db, [rows[:10], rows[10:], []])
+
+
+def test_export_streams_flattened_chunks(tmp_path):
+    db = _session(tmp_path / "source.db")
+    assert _seed(db) == ROWS
+
+    chunks = list(iter_plan_chunks(db, chunk_size=10))
+
+    assert [len(rows) for rows in chunks] == [10, 10, 5]
+    row = chunks[0][0]
+    assert list(row) == EXPORT_COLUMNS
+    assert row["food_type"] == "nonveg"
+    assert row["total_protein"] == 12.34
+    assert row["lunch_items"] == ITEM_SEPARATOR.join(f"Lunch dish {i}" for i in range(3))
+    assert decode_plan_json(row["plan_json"]) == _sample_plan()
+
+
+def test_export_filters_by_user(tmp_path):
+    db = _session(tmp_path / "source.db")
+    _seed(db)
+    rows = [row for chunk in iter_plan_chunks(db, chunk_size=4, user_id=1) for row in chunk]
+    assert rows and {row["user_id"] for row in rows} == {1}
+
+
+@pytest.mark.parametrize("fmt", [
+    "ndjson",
+    pytest.param("parquet", marks=PYARROW),
+    pytest.param("arrow", marks=PYARROW),
+])
+def test_export_import_round_trip(tmp_path, fmt):
+    source = _session(tmp_path / "source.db")
+    _seed(source)
+    archive = tmp_path / f"plans.{fmt}"
+    assert write_export(iter_plan_chunks(source, chunk_size=7), archive, fmt) == ROWS
+
+    target = _session(tmp_path / "target.db")
+    assert import_chunks(target, read_archive(archive, fmt, chunk_size=6), keep_ids=True) == ROWS
+
+    columns = [MealPlan.id, MealPlan.user_id, MealPlan.age, MealPlan.weight_kg,
+               MealPlan.calories_limit, MealPlan.food_type, MealPlan.plan_json]
+    query = select(*columns).order_by(MealPlan.id)
+    assert target.execute(query).all() == source.execute(query).all()
+    created = target.execute(select(MealPlan.created_at)).scalars().first()
+    assert created.replace(tzinfo=None) == datetime(2024, 1, 1)
+
+
+def test_import_without_ids_appends(tmp_path):
+    db = _session(tmp_path / "source.db")
+    _seed(db)
+    archive = tmp_path / "plans.ndjson"
+    write_export(iter_plan_chunks(db), archive, "ndjson")
+
+    import_chunks(db, read_archive(archive, "ndjson"))
+
+    assert db.execute(select(func.count(MealPlan.id))).scalar() == 2 * ROWS
+
+
+def test_import_rejects_rows_without_plan(tmp_path):
+    db = _session(tmp_path / "target.db")
+    with pytest.raises(ValueError):
+        import_chunks(db, [[{"id": 1, "user_id": 1, "age": 30, "weight_kg": 70.0,
+                             "calories_limit": 2000, "food_type": "veg", "plan_json": ""}]])
@@ -0,0 +1,153 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import plan_table as plan_table_module
+from app.data_loader import IndianFoodDataLoader, food_data_loader
+from app.main import app
+from app.models import FoodTypeEnum
+from app.plan_table import (
+    PlanTable, PlanTableStats, calorie_bucket, get_meal_plan, profile_key, protein_band, remove_old_versions,
+    resolve_table_path, versioned_table_path, write_plan_table,
+)
+
+KEY = profile_key(2000, "veg", 80)
+
+
+def _plan(name: str) -> dict:
+    return {
+        "breakfast": [{"name": name, "calories": 300}],
+        "lunch": [],
+        "dinner": [],
+        "total_calories": 300,
+        "meal_breakdown": {"breakfast": {"calories": 300, "target_calories": 500}},
+        "daily_targets": {"calories": 2000, "protein": 56.0},
+    }
+
+
+def _table(tmp_path, catalog_hash) -> PlanTable:
+    path = tmp_path / "plans.bin"
+    written = write_plan_table(path, {KEY: [_plan("Poha"), _plan("Upma")], "empty": []}, catalog_hash)
+    assert written == 2
+    return PlanTable(path)
+
+
+def test_profile_keys_use_calorie_buckets_and_protein_bands():
+    assert calorie_bucket(2099) == 2000
+    assert protein_band(76) == 80 and protein_band(83.9) == 80 and protein_band(72) == 70
+    assert profile_key(2099, FoodTypeEnum.veg, 78.5) == KEY
+
+
+def test_write_and_lookup(tmp_path):
+    table = _table(tmp_path, "abc")
+
+    assert len(table) == 1
+    assert table.catalog_hash == "abc"
+    assert table.lookup("missing") is None
+    assert table.lookup("empty") is None
+    names = {table.lookup(KEY)["breakfast"][0]["name"] for _ in range(50)}
+    assert names == {"Poha", "Upma"}
+    # Same seed, same alternative
+    assert table.lookup(KEY, rng=random.Random(7)) == table.lookup(KEY, rng=random.Random(7))
+
+
+def test_new_builds_do_not_overwrite_a_mapped_table(tmp_path):
+    base = tmp_path / "plan_table.bin"
+    assert resolve_table_path(base) is None
+
+    first = versioned_table_path(base)
+    write_plan_table(first, {KEY: [_plan("Poha")]}, "abc")
+    mapped = PlanTable(resolve_table_path(base))
+
+    second = versioned_table_path(base)
+    write_plan_table(second, {KEY: [_plan("Upma")]}, "abc")
+
+    assert first != second and first.exists()
+    assert resolve_table_path(base) == second
+    assert mapped.lookup(KEY)["breakfast"][0]["name"] == "Poha"
+    assert PlanTable(resolve_table_path(base)).lookup(KEY)["breakfast"][0]["name"] == "Upma"
+
+    assert remove_old_versions(base, keep=second) == 1
+    assert not first.exists() and second.exists()
+
+
+def test_rejects_files_that_are_not_plan_tables(tmp_path):
+    path = tmp_path / "plans.bin"
+    path.write_bytes(b"not a plan table")
+    with pytest.raises(ValueError):
+        PlanTable(path)
+
+
+def test_matching_table_is_served_with_request_targets(tmp_path, monkeypatch):
+    table = _table(tmp_path, food_data_loader.catalog.content_hash)
+    stats = PlanTableStats()
+    monkeypatch.setattr(plan_table_module, "plan_table", table)
+    monkeypatch.setattr(plan_table_module, "plan_table_stats", stats)
+
+    plan = get_meal_plan(30, 82, 2050, FoodTypeEnum.veg, gender="male", activity_level="sedentary")
+
+    assert plan["breakfast"][0]["name"] in {"Poha", "Upma"}
+    assert plan["daily_targets"] == {"calories": 2050, "protein": 82}
+    assert plan["meal_breakdown"]["breakfast"]["target_calories"] == int(2050 * 0.25)
+    assert stats.snapshot()["hits"] == 1
+
+
+def test_protein_requirement_selects_the_band(tmp_path, monkeypatch):
+    table = _table(tmp_path, food_data_loader.catalog.content_hash)
+    stats = PlanTableStats()
+    monkeypatch.setattr(plan_table_module, "plan_table", table)
+    monkeypatch.setattr(plan_table_module, "plan_table_stats", stats)
+
+    # 0.9 g/kg for women: 80 kg needs 72 g protein, which falls in the 70 g band
+    get_meal_plan(30, 80, 2000, FoodTypeEnum.veg, gender="female")
+    get_meal_plan(30, 60, 2000, FoodTypeEnum.veg, gender="male")
+    assert stats.snapshot()["misses"] == 2
+
+
+@pytest.mark.parametrize("catalog_hash", ["built-from-another-catalog", None])
+def test_stale_table_is_skipped(tmp_path, monkeypatch, catalog_hash):
+    table = _table(tmp_path, catalog_hash)
+    stats = PlanTableStats()
+    monkeypatch.setattr(plan_table_module, "plan_table", table)
+    monkeypatch.setattr(plan_table_module, "plan_table_stats", stats)
+
+    plan = get_meal_plan(30, 80, 2000, FoodTypeEnum.veg, gender="male", seed=1)
+
+    assert plan["breakfast"][0]["name"] not in {"Poha", "Upma"}
+    assert stats.snapshot() == {"hits": 0, "misses": 1, "stale": 1, "hit_rate": 0.0}
+
+
+def test_profiles_without_gender_are_table_misses(tmp_path, monkeypatch):
+    table = _table(tmp_path, food_data_loader.catalog.content_hash)
+    stats = PlanTableStats()
+    monkeypatch.setattr(plan_table_module, "plan_table", table)
+    monkeypatch.setattr(plan_table_module, "plan_table_stats", stats)
+
+    plan = get_meal_plan(30, 80, 2000, FoodTypeEnum.veg, gender=None)
+    assert plan["breakfast"][0]["name"] not in {"Poha", "Upma"}
+    # Activity level is not part of the key
+    plan = get_meal_plan(30, 80, 2000, FoodTypeEnum.veg, gender="male", activity_level=None)
+    assert plan["breakfast"][0]["name"] in {"Poha", "Upma"}
+    assert stats.snapshot()["misses"] == 1
+
+    response = TestClient(app).post("/api/meal/generate-test", json={
+        "age": 30, "weight_kg": 70, "calories_limit": 2000, "food_type": "veg", "gender": None,
+    })
+    assert response.status_code == 200
+
+
+def test_catalog_hash_tracks_content(tmp_path):
+    header = ("Dish Name,Calories (kcal),Carbohydrates (g),Protein (g),Fats (g),Free Sugar (g),"
+              "Fibre (g),Sodium (mg),Calcium (mg),Iron (mg),Vitamin C (mg),Folate (µg)\n")
+    source = tmp_path / "foods.csv"
+    source.write_text(header + "Dal makhani,150,10,6,8,1,3,300,40,2,1,20\n", encoding="utf-8")
+    loader = IndianFoodDataLoader(sources=[source])
+    before = loader.catalog.content_hash
+
+    loader.reload_if_changed(force=True)
+    assert loader.catalog.content_hash == before
+
+    source.write_text(header + "Dal makhani,180,10,6,8,1,3,300,40,2,1,20\n", encoding="utf-8")
+    loader.reload_if_changed(force=True)
+    assert loader.catalog.content_hash != before
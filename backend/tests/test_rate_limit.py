@@ -0,0 +1,72 @@
+import pytest
+from fastapi import HTTPException
+
+from app.rate_limit import InMemoryRateLimiterBackend, RateLimiter, parse_rate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_rate():
+    assert parse_rate("20/60") == (20, 20 / 60)
+    with pytest.raises(ValueError):
+        parse_rate("0/60")
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    backend = InMemoryRateLimiterBackend(clock=clock)
+
+    assert [backend.acquire("k", 3, 1.0)[0] for _ in range(4)] == [True, True, True, False]
+    assert backend.acquire("k", 3, 1.0) == (False, pytest.approx(1.0))
+
+    clock.now += 1.0
+    assert backend.acquire("k", 3, 1.0)[0]
+    assert not backend.acquire("k", 3, 1.0)[0]
+
+
+def test_limiter_raises_429_with_retry_after():
+    limiter = RateLimiter("test", "1/10", backend=InMemoryRateLimiterBackend(clock=FakeClock()))
+    limiter.check("user:1")
+    with pytest.raises(HTTPException) as exc:
+        limiter.check("user:1")
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "10"
+    limiter.check("user:2")  # keys are limited independently
+
+
+def test_prune_keeps_partially_used_buckets_of_other_scopes():
+    clock = FakeClock()
+    backend = InMemoryRateLimiterBackend(clock=clock)
+    slow = RateLimiter("slow", "2/3600", backend=backend)
+    fast = RateLimiter("fast", "100/1", backend=backend)
+
+    slow.check("ip:1")
+    slow.check("ip:1")
+    fast.check("ip:1")
+
+    # Long enough for the fast bucket to refill, far too short for the slow one
+    clock.now += backend.PRUNE_INTERVAL
+    fast.check("ip:2")
+
+    assert "fast:ip:1" not in backend._buckets
+    with pytest.raises(HTTPException):
+        slow.check("ip:1")
+
+
+def test_prune_runs_on_interval_only():
+    clock = FakeClock()
+    backend = InMemoryRateLimiterBackend(clock=clock)
+    backend.acquire("a", 1, 1.0)
+    clock.now += 5
+    backend.acquire("b", 1, 1.0)
+    assert set(backend._buckets) == {"a", "b"}  # "a" is full again but no sweep is due yet
+
+    clock.now += backend.PRUNE_INTERVAL
+    backend.acquire("c", 1, 1.0)
+    assert set(backend._buckets) == {"c"}
@@ -0,0 +1,111 @@
+import threading
+import time
+
+from app.single_flight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers):
+    results = [None] * callers
+    errors = [None] * callers
+
+    def call(i):
+        try:
+            results[i] = flight.do(key, fn)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def solve():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"breakfast": ["Poha"]}
+
+    threads, results, errors = _run_concurrently(flight, "profile", solve, 5)
+    # Wait until every follower has joined the in-flight call
+    for _ in range(500):
+        if flight.coalesced == 4:
+            break
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == [1]
+    assert flight.coalesced == 4
+    assert errors == [None] * 5
+    assert all(result == {"breakfast": ["Poha"]} for result in results)
+    # Callers get independent copies
+    assert len({id(result) for result in results}) == 5
+
+
+def test_errors_propagate_to_waiters_and_are_not_cached():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(timeout=5)
+        raise RuntimeError("solver failed")
+
+    threads, _, errors = _run_concurrently(flight, "profile", fail, 3)
+    for _ in range(500):
+        if flight.coalesced == 2:
+            break
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert flight.do("profile", lambda: "fresh") == "fresh"
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.coalesced == 0
+
+
+def test_coalesced_requests_each_count_towards_plan_table_stats(monkeypatch):
+    from app import routes_meal
+    from app.plan_table import PlanTableStats
+    from app.schemas import MealGenerateRequest
+
+    release = threading.Event()
+    calls = []
+
+    def lookup_or_solve(**kwargs):
+        calls.append(kwargs)
+        release.wait(timeout=5)
+        return {"breakfast": ["Poha"]}, True, False
+
+    flight = SingleFlight()
+    stats = PlanTableStats()
+    monkeypatch.setattr(routes_meal, "lookup_or_solve", lookup_or_solve)
+    monkeypatch.setattr(routes_meal, "plan_flight", flight)
+    monkeypatch.setattr(routes_meal, "plan_table_stats", stats)
+    payload = MealGenerateRequest(age=30, weight_kg=70, calories_limit=2000, food_type="veg")
+
+    threads = [threading.Thread(target=routes_meal._solve, args=(payload,)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for _ in range(500):
+        if flight.coalesced == 2:
+            break
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert stats.snapshot()["hits"] == 3